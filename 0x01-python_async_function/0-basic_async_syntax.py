@@ -6,12 +6,56 @@ Basic async syntax module
 
 import asyncio
 import random
+from array import array
+from typing import Any, Awaitable, Callable, Optional, Sequence
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
-async def wait_random(max_delay: int = 10) -> float:
+
+async def wait_random(max_delay: int = 10,
+                      sleep: Callable[[float], Awaitable[Any]] = asyncio.sleep
+                      ) -> float:
     """
     Asynchronous coroutine that waits for a random delay.
+    Pass a SleepService's sleep method as sleep to share one timer
+    between many waiters instead of using asyncio.sleep.
     """
     random_delay = random.uniform(0, max_delay)
-    await asyncio.sleep(random_delay)
+    await sleep(random_delay)
     return random_delay
+
+
+async def wait_delay(delay: float,
+                     sleep: Callable[[float], Awaitable[Any]] = asyncio.sleep
+                     ) -> float:
+    """
+    Asynchronous coroutine that waits for an already drawn delay
+    and returns it.
+    """
+    await sleep(delay)
+    return delay
+
+
+def draw_delays(n: int, max_delay: int,
+                seed: Optional[int] = None) -> Sequence[float]:
+    """
+    Draw n random delays between 0 and max_delay in a single batch.
+
+    Args:
+        n (int): Number of delays to draw.
+        max_delay (int): Upper bound of every delay.
+        seed (int, optional): Seed of the random generator, for
+        reproducible draws. NumPy and random.Random turn the same seed
+        into different delays, so draws only repeat between runs that
+        both have NumPy installed or both do not.
+
+    Returns:
+        A NumPy array when NumPy is installed, otherwise an array('d').
+    """
+    if np is not None:
+        return np.random.default_rng(seed).uniform(0, max_delay, n)
+    rng = random.Random(seed)
+    return array('d', (rng.uniform(0, max_delay) for _ in range(n)))
@@ -2,6 +2,8 @@
 
 import asyncio
 
+__import__('_bootstrap')
+
 wait_random = __import__('0-basic_async_syntax').wait_random
 
 print(asyncio.run(wait_random()))
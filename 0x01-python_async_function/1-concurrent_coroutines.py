@@ -6,18 +6,107 @@ Concurrent coroutines module
 
 import asyncio
 import random
-from typing import List
+from typing import AsyncIterator, Awaitable, Callable, List, Optional, Set
 
 
-wait_random = __import__('0-basic_async_syntax').wait_random
+basic_async_syntax = __import__('0-basic_async_syntax')
+wait_random = basic_async_syntax.wait_random
+wait_delay = basic_async_syntax.wait_delay
+draw_delays = basic_async_syntax.draw_delays
 
 
-async def wait_n(n: int, max_delay: int) -> List[float]:
+def batched_waiters(n: int, max_delay: int,
+                    seed: Optional[int] = None
+                    ) -> Callable[[], Awaitable[float]]:
     """
-    Asynchronous routine that spawns wait_random n times
+    Draw n delays in one batch and return a factory that hands the
+    next delay to a new wait_delay coroutine on each call.
+    """
+    delays = map(float, draw_delays(n, max_delay, seed))
+    return lambda: wait_delay(next(delays))
+
+
+async def iter_completed(factory: Callable[[], Awaitable[float]], n: int,
+                         max_concurrency: Optional[int] = None
+                         ) -> AsyncIterator[float]:
+    """
+    Asynchronous generator that awaits factory() n times and yields
+    each result as soon as it is ready, in completion order.
+
+    Args:
+        factory: Callable returning a new awaitable on each call.
+        n (int): Total number of awaitables to run.
+        max_concurrency (int, optional): Maximum number of tasks in
+        flight at once. A new task is started every time one finishes,
+        so at most max_concurrency coroutines and tasks exist at a time.
+        Defaults to running all n at once.
+    """
+    if max_concurrency is not None and max_concurrency < 1:
+        raise ValueError("max_concurrency must be at least 1")
+    if max_concurrency is None:
+        max_concurrency = n
+    finished: asyncio.Queue = asyncio.Queue()
+    in_flight: Set[asyncio.Future] = set()
+    remaining = n
+
+    def on_done(task: asyncio.Future) -> None:
+        in_flight.discard(task)
+        finished.put_nowait(task)
+        if remaining:
+            spawn()
+
+    def spawn() -> None:
+        nonlocal remaining
+        remaining -= 1
+        task = asyncio.ensure_future(factory())
+        in_flight.add(task)
+        task.add_done_callback(on_done)
+
+    for _ in range(min(max_concurrency, n)):
+        spawn()
+    try:
+        for _ in range(n):
+            task = await finished.get()
+            yield task.result()
+    finally:
+        remaining = 0
+        for task in list(in_flight):
+            task.cancel()
+
+
+async def iter_wait_n(n: int, max_delay: int,
+                      max_concurrency: Optional[int] = None,
+                      batched: bool = False, seed: Optional[int] = None
+                      ) -> AsyncIterator[float]:
+    """
+    Asynchronous generator that spawns wait_random n times
     with the specified max_delay.
+    Yields each delay as soon as its coroutine finishes, in completion
+    order. That is roughly ascending order, but not exactly: each
+    deadline also depends on when its coroutine started, and
+    max_concurrency staggers the starts further.
+    With batched, or when a seed is given, all n delays are drawn
+    up front in one batch by draw_delays.
+    """
+    if batched or seed is not None:
+        factory = batched_waiters(n, max_delay, seed)
+    else:
+        def factory() -> Awaitable[float]:
+            return wait_random(max_delay)
+    async for delay in iter_completed(factory, n, max_concurrency):
+        yield delay
+
+
+async def wait_n(n: int, max_delay: int,
+                 max_concurrency: Optional[int] = None,
+                 batched: bool = False,
+                 seed: Optional[int] = None) -> List[float]:
+    """
+    Asynchronous routine that spawns wait_random n times
+    with the specified max_delay, at most max_concurrency at a time.
     Returns a list of delays in ascending order.
     """
-    tasks = [wait_random(max_delay) for _ in range(n)]
-    delays = await asyncio.gather(*tasks)
+    delays = [delay async for delay in iter_wait_n(n, max_delay,
+                                                   max_concurrency,
+                                                   batched, seed)]
     return sorted(delays)
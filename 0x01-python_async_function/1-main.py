@@ -4,6 +4,8 @@ Test file for printing the correct output of the wait_n coroutine
 '''
 import asyncio
 
+__import__('_bootstrap')
+
 wait_n = __import__('1-concurrent_coroutines').wait_n
 
 print(asyncio.run(wait_n(5, 5)))
@@ -1,5 +1,7 @@
 #!/usr/bin/env python3
 
+__import__('_bootstrap')
+
 measure_time = __import__('2-measure_runtime').measure_time
 
 n = 5
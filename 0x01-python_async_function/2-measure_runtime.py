@@ -6,27 +6,72 @@ Measure runtime module
 
 import asyncio
 import random
-from typing import List
 import time
-
+from typing import Dict, List
 
 wait_n = __import__('1-concurrent_coroutines').wait_n
 
 
-def measure_time(n: int, max_delay: int) -> float:
+def measure_time(n: int, max_delay: int,
+                 repeat: int = 1, warmup: int = 0) -> float:
     """
     Measure the total execution time for wait_n(n, max_delay).
 
     Args:
       n (int): Number of times to spawn wait_random coroutine.
       max_delay (int): Maximum delay in seconds for each wait_random call.
+      repeat (int): Number of measured runs.
+      warmup (int): Number of discarded runs before measuring.
 
     Returns:
-      float: Total execution time for wait_n(n, max_delay) divided by n.
+      float: Median execution time for wait_n(n, max_delay) divided by n.
+
+    The harness module of tools/ must be importable; the *-main.py
+    scripts and the benchmarks put it on sys.path.
+    """
+    harness = __import__('harness')
+    result = harness.bench(lambda: asyncio.run(wait_n(n, max_delay)),
+                           name="measure_time", warmup=warmup,
+                           repeat=repeat,
+                           params={"n": n, "max_delay": max_delay})
+    return result.median_s / n
+
+
+def measure_time_on_loop(n: int, max_delay: int,
+                         repeat: int = 5, warmup: int = 1) -> Dict[str, float]:
     """
+    Measure wait_n(n, max_delay) repeatedly on one persistent event loop,
+    so the cost of creating and closing a loop is paid once and reported
+    on its own instead of being folded into every run like measure_time.
 
-    start_time = time.time()
-    asyncio.run(wait_n(n, max_delay))
-    end_time = time.time()
-    total_time = end_time - start_time
-    return total_time / n
+    Args:
+      n (int): Number of times to spawn wait_random coroutine.
+      max_delay (int): Maximum delay in seconds for each wait_random call.
+      repeat (int): Number of measured runs.
+      warmup (int): Number of discarded runs before measuring.
+
+    Returns:
+      Dict[str, float]: Seconds spent creating the loop (loop_setup) and
+      closing it (loop_teardown), median seconds per run (run), and that
+      median divided by n (per_task).
+    """
+    harness = __import__('harness')
+    start = time.perf_counter_ns()
+    loop = asyncio.new_event_loop()
+    setup_ns = time.perf_counter_ns() - start
+    try:
+        result = harness.bench(
+            lambda: loop.run_until_complete(wait_n(n, max_delay)),
+            name="measure_time_on_loop", warmup=warmup, repeat=repeat,
+            params={"n": n, "max_delay": max_delay})
+    finally:
+        start = time.perf_counter_ns()
+        loop.run_until_complete(loop.shutdown_asyncgens())
+        loop.close()
+        teardown_ns = time.perf_counter_ns() - start
+    return {
+        "loop_setup": setup_ns / harness.NS_PER_S,
+        "loop_teardown": teardown_ns / harness.NS_PER_S,
+        "run": result.median_s,
+        "per_task": result.median_s / n,
+    }
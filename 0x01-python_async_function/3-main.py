@@ -2,6 +2,8 @@
 
 import asyncio
 
+__import__('_bootstrap')
+
 task_wait_random = __import__('3-tasks').task_wait_random
 
 
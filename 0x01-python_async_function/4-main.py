@@ -2,6 +2,8 @@
 
 import asyncio
 
+__import__('_bootstrap')
+
 task_wait_n = __import__('4-tasks').task_wait_n
 
 n = 5
@@ -2,14 +2,19 @@
 """
 Tasks module
 """
-import asyncio
 import random
-from typing import List
+from typing import Awaitable, List, Optional
 
 task_wait_random = __import__('3-tasks').wait_random
+concurrent_coroutines = __import__('1-concurrent_coroutines')
+iter_completed = concurrent_coroutines.iter_completed
+batched_waiters = concurrent_coroutines.batched_waiters
 
 
-async def task_wait_n(n: int, max_delay: int) -> List[float]:
+async def task_wait_n(n: int, max_delay: int,
+                      max_concurrency: Optional[int] = None,
+                      batched: bool = False,
+                      seed: Optional[int] = None) -> List[float]:
     """
     Asynchronous coroutine that spawns task_wait_random n times.
 
@@ -17,10 +22,19 @@ async def task_wait_n(n: int, max_delay: int) -> List[float]:
         n (int): Number of times to spawn task_wait_random coroutine.
         max_delay (int): Maximum delay in seconds
         for each task_wait_random call.
+        max_concurrency (int, optional): Maximum number of tasks
+        in flight at once. Defaults to spawning all n up front.
+        batched (bool): Draw all n delays in one batch up front.
+        seed (int, optional): Seed of the batched draw, implies batched.
 
     Returns:
         List[float]: List of delays in ascending order.
     """
-    tasks = [task_wait_random(max_delay) for _ in range(n)]
-    delays = await asyncio.gather(*tasks)
+    if batched or seed is not None:
+        factory = batched_waiters(n, max_delay, seed)
+    else:
+        def factory() -> Awaitable[float]:
+            return task_wait_random(max_delay)
+    delays = [delay async for delay in iter_completed(
+        factory, n, max_concurrency)]
     return sorted(delays)
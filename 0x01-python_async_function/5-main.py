@@ -0,0 +1,16 @@
+#!/usr/bin/env python3
+'''
+Test file for printing the delays of iter_wait_n as they complete
+'''
+import asyncio
+
+__import__('_bootstrap')
+
+iter_wait_n = __import__('1-concurrent_coroutines').iter_wait_n
+
+
+async def main(n: int, max_delay: int) -> None:
+    async for delay in iter_wait_n(n, max_delay):
+        print(delay)
+
+asyncio.run(main(5, 3))
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Sleep service module
+
+A SleepService keeps every pending sleep in one heap and lets a single
+driver coroutine wake all sleepers whose deadline has passed in one
+batch, so the event loop only ever holds one timer handle for them.
+"""
+import asyncio
+import heapq
+import itertools
+import time
+from typing import Any, List, Optional, Tuple
+
+CLOCK_RESOLUTION = time.get_clock_info('monotonic').resolution
+
+
+class SleepService:
+    """
+    Shared replacement for asyncio.sleep for large fan-outs.
+
+    The service binds to the running event loop when its driver starts
+    and releases it once no sleeper is left, so one instance can be
+    reused across successive asyncio.run calls.
+    """
+
+    def __init__(self) -> None:
+        """Init method of SleepService"""
+        self._heap: List[Tuple[float, int, asyncio.Future]] = []
+        self._counter = itertools.count()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._driver: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Future] = None
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._timer_at = float('inf')
+        self._cancelled = 0
+
+    def __len__(self) -> int:
+        """Number of sleepers still waiting"""
+        return len(self._heap) - self._cancelled
+
+    async def sleep(self, delay: float, result: Any = None) -> Any:
+        """
+        Coroutine that completes after delay seconds, like asyncio.sleep.
+
+        Args:
+            delay (float): Number of seconds to sleep.
+            result: Value returned once the sleep is over.
+
+        Returns:
+            The given result.
+        """
+        if delay <= 0:
+            return await asyncio.sleep(0, result)
+        loop = asyncio.get_running_loop()
+        if self._driver is None:
+            self._loop = loop
+        elif loop is not self._loop:
+            raise RuntimeError("SleepService is in use by another loop")
+        deadline = loop.time() + delay
+        waiter = loop.create_future()
+        heapq.heappush(self._heap, (deadline, next(self._counter), waiter))
+        if self._driver is None:
+            self._driver = loop.create_task(self._drive())
+        elif self._timer is not None and deadline < self._timer_at:
+            # the driver arms the timer itself when it starts or wakes
+            self._arm(deadline)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.cancelled():
+                self._discard_cancelled()
+            raise
+        return result
+
+    def _discard_cancelled(self) -> None:
+        """Count a cancelled sleeper and rebuild the heap without the
+        cancelled ones once they make up half of it, moving the timer to
+        the earliest deadline left"""
+        self._cancelled += 1
+        if self._cancelled * 2 < len(self._heap):
+            return
+        self._heap[:] = [item for item in self._heap
+                         if not item[2].cancelled()]
+        heapq.heapify(self._heap)
+        self._cancelled = 0
+        if not self._heap:
+            self._wake()
+        elif self._timer is not None and self._heap[0][0] != self._timer_at:
+            self._arm(self._heap[0][0])
+
+    def _arm(self, deadline: float) -> None:
+        """Point the single timer handle at the given deadline"""
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer_at = deadline
+        self._timer = self._loop.call_at(deadline, self._wake)
+
+    def _wake(self) -> None:
+        """Timer callback that resumes the driver"""
+        self._timer = None
+        self._timer_at = float('inf')
+        if self._wakeup is not None and not self._wakeup.done():
+            self._wakeup.set_result(None)
+
+    async def _drive(self) -> None:
+        """Driver coroutine that wakes expired sleepers in batches"""
+        loop, heap = self._loop, self._heap
+        try:
+            while heap:
+                self._wakeup = loop.create_future()
+                self._arm(heap[0][0])
+                await self._wakeup
+                now = loop.time() + CLOCK_RESOLUTION
+                while heap and heap[0][0] <= now:
+                    waiter = heapq.heappop(heap)[2]
+                    if waiter.cancelled():
+                        self._cancelled -= 1
+                    elif not waiter.done():
+                        waiter.set_result(None)
+        finally:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            self._timer_at = float('inf')
+            self._wakeup = None
+            self._driver = None
+            self._cancelled = 0
+            for _, _, waiter in heap:
+                waiter.cancel()
+            heap.clear()
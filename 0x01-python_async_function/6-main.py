@@ -0,0 +1,13 @@
+#!/usr/bin/env python3
+
+
+__import__('_bootstrap')
+
+measure_time = __import__('2-measure_runtime').measure_time
+measure_time_on_loop = __import__('2-measure_runtime').measure_time_on_loop
+
+n = 100
+max_delay = 0
+
+print(measure_time(n, max_delay, repeat=20))
+print(measure_time_on_loop(n, max_delay, repeat=20))
@@ -0,0 +1,16 @@
+#!/usr/bin/env python3
+"""
+Start-up shared by the *-main.py entry points of this folder: puts the
+tools folder on sys.path and installs the event loop named by the
+ASYNC_LOOP environment variable (see tools/loops.py).
+
+Entry points run it with `__import__('_bootstrap')` before anything else.
+"""
+import os
+import sys
+
+TOOLS = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                     os.pardir, 'tools')
+if TOOLS not in sys.path:
+    sys.path.insert(0, TOOLS)
+__import__('loops').install_from_env()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Unit tests for 5-sleep_service.py
+"""
+
+import asyncio
+import unittest
+
+SleepService = __import__('5-sleep_service').SleepService
+
+
+class TestSleepService(unittest.IsolatedAsyncioTestCase):
+    """
+    Test cases for SleepService
+    """
+    async def test_wakes_in_deadline_order(self):
+        """
+        Test sleepers wake by deadline, not by the order they slept in
+        """
+        service = SleepService()
+        woken = []
+
+        async def sleeper(delay):
+            woken.append(await service.sleep(delay, delay))
+
+        await asyncio.gather(*(sleeper(delay)
+                               for delay in (0.03, 0.01, 0.02, 0.01)))
+        self.assertEqual(woken, [0.01, 0.01, 0.02, 0.03])
+        self.assertEqual(len(service), 0)
+        self.assertIsNone(service._driver)
+
+    async def test_non_positive_delay(self):
+        """
+        Test a delay of zero or less yields without starting the driver
+        """
+        service = SleepService()
+        self.assertEqual(await service.sleep(0, "now"), "now")
+        self.assertEqual(await service.sleep(-1, "now"), "now")
+        self.assertIsNone(service._driver)
+
+    async def test_cancel_removes_entry_and_rearms(self):
+        """
+        Test cancelling the earliest sleeper drops it from the heap and
+        moves the timer to the next deadline
+        """
+        service = SleepService()
+        first = asyncio.ensure_future(service.sleep(0.01))
+        second = asyncio.ensure_future(service.sleep(0.05, "second"))
+        while service._timer is None:
+            await asyncio.sleep(0)
+        self.assertEqual(len(service._heap), 2)
+        early = service._timer_at
+        self.assertEqual(early, service._heap[0][0])
+
+        first.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await first
+        self.assertEqual(len(service), 1)
+        self.assertEqual(len(service._heap), 1)
+        self.assertEqual(service._timer_at, service._heap[0][0])
+        self.assertGreater(service._timer_at, early)
+        self.assertEqual(await second, "second")
+        self.assertIsNone(service._driver)
+
+    async def test_cancel_last_sleeper_stops_driver(self):
+        """
+        Test cancelling the only sleeper stops the driver and its timer
+        """
+        service = SleepService()
+        sleeper = asyncio.ensure_future(service.sleep(10))
+        await asyncio.sleep(0)
+        sleeper.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await sleeper
+        await asyncio.sleep(0)
+        self.assertEqual(len(service), 0)
+        self.assertIsNone(service._driver)
+        self.assertIsNone(service._timer)
+
+
+class TestSleepServiceAcrossRuns(unittest.TestCase):
+    """
+    Test cases for a SleepService outliving its event loop
+    """
+    def test_reuse_across_asyncio_run(self):
+        """
+        Test one service serves successive asyncio.run calls
+        """
+        service = SleepService()
+
+        async def main(result):
+            return await asyncio.gather(service.sleep(0.02, result),
+                                        service.sleep(0.01, result))
+
+        self.assertEqual(asyncio.run(main("a")), ["a", "a"])
+        self.assertEqual(asyncio.run(main("b")), ["b", "b"])
+        self.assertIsNone(service._driver)
+
+    def test_sleepers_left_when_loop_stops(self):
+        """
+        Test a run that ends with sleepers pending leaves the service
+        usable by the next run
+        """
+        service = SleepService()
+
+        async def abandon():
+            asyncio.ensure_future(service.sleep(10))
+            await asyncio.sleep(0)
+
+        asyncio.run(abandon())
+        self.assertEqual(len(service), 0)
+        self.assertEqual(asyncio.run(service.sleep(0.01, "next")), "next")
+
+
+if __name__ == '__main__':
+    unittest.main()
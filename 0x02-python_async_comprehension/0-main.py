@@ -2,6 +2,8 @@
 
 import asyncio
 
+__import__('_bootstrap')
+
 async_generator = __import__('0-async_generator').async_generator
 
 async def print_yielded_values():
@@ -1,11 +1,13 @@
 #!/usr/bin/env python3
 """
 This module defines an asynchronous coroutine `async_comprehension`
-that collects 10 random numbers using an async comprehension and returns them.
+that collects 10 random numbers using an async comprehension and returns them,
+and `async_comprehension_chunks`, its lazy counterpart that streams
+fixed-size chunks and stops pulling from upstream as soon as it can.
 """
 import asyncio
 import random
-from typing import List
+from typing import AsyncIterator, Callable, List, Optional
 async_generator = __import__('0-async_generator').async_generator
 
 
@@ -15,3 +17,45 @@ async def async_comprehension() -> List[float]:
     10 random numbers from the async_generator and returns them as a list.
     """
     return [_ async for _ in async_generator()]
+
+
+async def async_comprehension_chunks(
+        limit: Optional[int] = None,
+        predicate: Optional[Callable[[float], bool]] = None,
+        chunk_size: int = 10,
+        source: Optional[AsyncIterator[float]] = None
+) -> AsyncIterator[List[float]]:
+    """
+    An asynchronous generator that pulls values from source (a new
+    async_generator by default) only when the consumer asks for more,
+    keeps those that satisfy predicate, and yields them in lists of
+    chunk_size (the last one may be shorter).
+
+    Once limit values have been kept, or when the consumer stops
+    iterating, source is closed so that upstream stages stop too.
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+    if source is None:
+        source = async_generator()
+    chunk: List[float] = []
+    kept = 0
+    try:
+        if limit is not None and limit <= 0:
+            return
+        async for value in source:
+            if predicate is not None and not predicate(value):
+                continue
+            chunk.append(value)
+            kept += 1
+            if len(chunk) == chunk_size:
+                yield chunk
+                chunk = []
+            if kept == limit:
+                break
+        if chunk:
+            yield chunk
+    finally:
+        aclose = getattr(source, "aclose", None)
+        if aclose is not None:
+            await aclose()
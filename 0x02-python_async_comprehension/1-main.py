@@ -2,6 +2,8 @@
 
 import asyncio
 
+__import__('_bootstrap')
+
 async_comprehension = __import__('1-async_comprehension').async_comprehension
 
 
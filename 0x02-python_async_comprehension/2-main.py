@@ -2,6 +2,8 @@
 
 import asyncio
 
+__import__('_bootstrap')
+
 
 measure_runtime = __import__('2-measure_runtime').measure_runtime
 
@@ -7,16 +7,20 @@ four times in parallel.
 It imports `async_comprehension` from the previous task.
 """
 import asyncio
-import time
+
 async_comprehension = __import__('1-async_comprehension').async_comprehension
 
 
-async def measure_runtime() -> float:
+async def measure_runtime(repeat: int = 1, warmup: int = 0) -> float:
     """
     An asynchronous coroutine that measures the total runtime of running
     async_comprehension four times in parallel using asyncio.gather.
+    With repeat and warmup, the median of the measured runs is returned.
+    The harness module of tools/ must be importable; the *-main.py
+    scripts and the benchmarks put it on sys.path.
     """
-    start_time = time.time()
-    await asyncio.gather(*(async_comprehension() for _ in range(4)))
-    end_time = time.time()
-    return end_time - start_time
+    harness = __import__('harness')
+    result = await harness.abench(
+        lambda: asyncio.gather(*(async_comprehension() for _ in range(4))),
+        name="measure_runtime", warmup=warmup, repeat=repeat)
+    return result.median_s
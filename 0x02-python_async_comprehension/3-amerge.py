@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+This module defines `amerge`, an asynchronous generator that merges
+several async generators (such as `async_generator`) into one stream,
+yielding items in the order they become ready.
+"""
+import asyncio
+from typing import Any, AsyncIterator, List
+
+_DONE = object()
+
+
+class _Failure:
+    """Wraps an exception raised by one of the merged generators."""
+    __slots__ = ("exc",)
+
+    def __init__(self, exc: BaseException) -> None:
+        """Init method of _Failure"""
+        self.exc = exc
+
+
+async def amerge(*agens: AsyncIterator[Any],
+                 maxsize: int = 64) -> AsyncIterator[Any]:
+    """
+    An asynchronous generator that runs one pump task per generator in
+    agens and yields their items as soon as any of them produces one.
+
+    Pumps hand items over through a queue of at most maxsize items, so
+    a fast producer waits for the consumer instead of buffering without
+    limit. If a generator raises, the exception is re-raised here; when
+    the consumer stops early, every pump is cancelled and every
+    generator is closed.
+    """
+    if maxsize < 1:
+        raise ValueError("maxsize must be at least 1")
+    queue: asyncio.Queue = asyncio.Queue(maxsize)
+
+    async def pump(agen: AsyncIterator[Any]) -> None:
+        try:
+            async for item in agen:
+                await queue.put(item)
+        except Exception as exc:
+            await queue.put(_Failure(exc))
+        else:
+            await queue.put(_DONE)
+        finally:
+            aclose = getattr(agen, "aclose", None)
+            if aclose is not None:
+                await aclose()
+
+    pumps: List[asyncio.Task] = [asyncio.ensure_future(pump(agen))
+                                 for agen in agens]
+    active = len(pumps)
+    try:
+        while active:
+            item = await queue.get()
+            if item is _DONE:
+                active -= 1
+            elif type(item) is _Failure:
+                raise item.exc
+            else:
+                yield item
+    finally:
+        for task in pumps:
+            task.cancel()
+        await asyncio.gather(*pumps, return_exceptions=True)
@@ -0,0 +1,16 @@
+#!/usr/bin/env python3
+
+import asyncio
+
+__import__('_bootstrap')
+
+async_comprehension_chunks = __import__(
+    '1-async_comprehension').async_comprehension_chunks
+
+
+async def main():
+    async for chunk in async_comprehension_chunks(
+            limit=5, predicate=lambda x: x > 2, chunk_size=2):
+        print(chunk)
+
+asyncio.run(main())
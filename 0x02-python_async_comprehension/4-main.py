@@ -0,0 +1,17 @@
+#!/usr/bin/env python3
+
+import asyncio
+
+__import__('_bootstrap')
+
+async_generator = __import__('0-async_generator').async_generator
+amerge = __import__('3-amerge').amerge
+
+
+async def main():
+    result = []
+    async for i in amerge(*(async_generator() for _ in range(4))):
+        result.append(i)
+    print(len(result), result[:4])
+
+asyncio.run(main())
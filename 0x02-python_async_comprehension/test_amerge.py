@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Unit tests for 3-amerge.py
+"""
+
+import asyncio
+import unittest
+
+amerge = __import__('3-amerge').amerge
+
+
+async def numbers(name, count, closed, delay=0.0, fail_at=None):
+    """
+    Async generator yielding (name, i) for i below count, raising
+    ValueError at fail_at and recording name in closed when it ends
+    """
+    try:
+        for i in range(count):
+            await asyncio.sleep(delay)
+            if i == fail_at:
+                raise ValueError("{} failed".format(name))
+            yield name, i
+    finally:
+        closed.append(name)
+
+
+class TestAmerge(unittest.IsolatedAsyncioTestCase):
+    """
+    Test cases for amerge
+    """
+    async def test_merges_every_item(self):
+        """
+        Test every item of every generator is yielded once, in the
+        order each generator produced them
+        """
+        closed = []
+        items = [item async for item in amerge(
+            numbers("a", 5, closed, 0.002), numbers("b", 3, closed, 0.003))]
+        self.assertEqual(sorted(items),
+                         [("a", i) for i in range(5)] +
+                         [("b", i) for i in range(3)])
+        for name in ("a", "b"):
+            self.assertEqual([i for n, i in items if n == name],
+                             sorted(i for n, i in items if n == name))
+        self.assertCountEqual(closed, ["a", "b"])
+
+    async def test_yields_as_ready(self):
+        """
+        Test a fast generator is not held back by a slow one
+        """
+        closed = []
+        merged = amerge(numbers("slow", 1, closed, 0.2),
+                        numbers("fast", 3, closed))
+        first = [await merged.__anext__() for _ in range(3)]
+        self.assertEqual(first, [("fast", 0), ("fast", 1), ("fast", 2)])
+        await merged.aclose()
+
+    async def test_error_propagates_and_closes_sources(self):
+        """
+        Test an exception of one generator is raised to the consumer and
+        the other generators are closed
+        """
+        closed = []
+        merged = amerge(numbers("bad", 5, closed, 0.001, fail_at=2),
+                        numbers("endless", 10 ** 6, closed, 0.001))
+        with self.assertRaisesRegex(ValueError, "bad failed"):
+            async for _ in merged:
+                pass
+        self.assertCountEqual(closed, ["bad", "endless"])
+
+    async def test_early_stop_closes_sources(self):
+        """
+        Test stopping the merged stream early closes every generator
+        """
+        closed = []
+        merged = amerge(numbers("a", 10 ** 6, closed),
+                        numbers("b", 10 ** 6, closed))
+        async for _ in merged:
+            break
+        await merged.aclose()
+        self.assertCountEqual(closed, ["a", "b"])
+
+    async def test_bounded_queue(self):
+        """
+        Test a producer runs at most maxsize items ahead of the consumer
+        """
+        produced = []
+
+        async def producer():
+            for i in range(100):
+                produced.append(i)
+                yield i
+
+        merged = amerge(producer(), maxsize=4)
+        self.assertEqual(await merged.__anext__(), 0)
+        for _ in range(10):
+            await asyncio.sleep(0)
+        self.assertLessEqual(len(produced), 4 + 2)
+        await merged.aclose()
+
+    async def test_invalid_maxsize(self):
+        """
+        Test a maxsize below 1 is rejected
+        """
+        with self.assertRaises(ValueError):
+            await amerge(maxsize=0).__anext__()
+
+    async def test_no_generators(self):
+        """
+        Test merging nothing yields nothing
+        """
+        self.assertEqual([item async for item in amerge()], [])
+
+
+if __name__ == '__main__':
+    unittest.main()
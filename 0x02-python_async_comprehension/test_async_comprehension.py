@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Unit tests for 1-async_comprehension.py
+"""
+
+import asyncio
+import unittest
+
+async_comprehension_chunks = __import__(
+    '1-async_comprehension').async_comprehension_chunks
+
+
+class Source:
+    """
+    Async iterator over values that counts how many were pulled and
+    records when it is closed
+    """
+    def __init__(self, values):
+        """
+        Init method of Source
+        """
+        self.values = iter(values)
+        self.pulled = 0
+        self.closed = False
+
+    def __aiter__(self):
+        """
+        Source is its own iterator
+        """
+        return self
+
+    async def __anext__(self):
+        """
+        Next value, after yielding to the loop once
+        """
+        await asyncio.sleep(0)
+        try:
+            value = next(self.values)
+        except StopIteration:
+            raise StopAsyncIteration
+        self.pulled += 1
+        return value
+
+    async def aclose(self):
+        """
+        Record that the source was closed
+        """
+        self.closed = True
+
+
+class TestAsyncComprehensionChunks(unittest.IsolatedAsyncioTestCase):
+    """
+    Test cases for async_comprehension_chunks
+    """
+    async def collect(self, **kwargs):
+        """
+        Every chunk of async_comprehension_chunks(**kwargs)
+        """
+        return [chunk async for chunk in async_comprehension_chunks(**kwargs)]
+
+    async def test_chunks(self):
+        """
+        Test values come in chunk_size lists, the last one shorter
+        """
+        source = Source(range(7))
+        self.assertEqual(await self.collect(chunk_size=3, source=source),
+                         [[0, 1, 2], [3, 4, 5], [6]])
+        self.assertTrue(source.closed)
+
+    async def test_limit_and_predicate(self):
+        """
+        Test only values passing predicate are kept, and pulling stops
+        once limit of them are kept
+        """
+        source = Source(range(100))
+        chunks = await self.collect(limit=5, chunk_size=2, source=source,
+                                    predicate=lambda value: value % 3 == 0)
+        self.assertEqual(chunks, [[0, 3], [6, 9], [12]])
+        self.assertEqual(source.pulled, 13)
+        self.assertTrue(source.closed)
+
+    async def test_non_positive_limit(self):
+        """
+        Test a limit of zero yields nothing and pulls nothing
+        """
+        source = Source(range(10))
+        self.assertEqual(await self.collect(limit=0, source=source), [])
+        self.assertEqual(source.pulled, 0)
+        self.assertTrue(source.closed)
+
+    async def test_early_stop_closes_source(self):
+        """
+        Test stopping after the first chunk closes the source without
+        pulling past that chunk
+        """
+        source = Source(range(100))
+        chunks = async_comprehension_chunks(chunk_size=4, source=source)
+        self.assertEqual(await chunks.__anext__(), [0, 1, 2, 3])
+        await chunks.aclose()
+        self.assertEqual(source.pulled, 4)
+        self.assertTrue(source.closed)
+
+    async def test_invalid_chunk_size(self):
+        """
+        Test a chunk_size below 1 is rejected
+        """
+        with self.assertRaises(ValueError):
+            await self.collect(chunk_size=0, source=Source([]))
+
+
+if __name__ == '__main__':
+    unittest.main()
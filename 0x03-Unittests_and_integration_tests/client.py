@@ -1,31 +1,389 @@
 #!/usr/bin/env python3
 """A github org client
 """
+import asyncio
+import heapq
+import sys
+import threading
+import time
+from array import array
+from bisect import bisect_right
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Iterable,
+    Iterator,
     List,
     Dict,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
 )
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
 
 from utils import (
+    AsyncJSONClient,
+    aget_json,
+    aget_json_page,
     get_json,
-    access_nested_map,
+    get_json_page,
+    amemoize,
+    compile_path,
     memoize,
+    pluck,
+    pluck_many,
 )
 
+# RepoTable columns: name, path in a repo, array typecode (None for text)
+REPO_COLUMNS = (
+    ("name", ("name",), None),
+    ("license", ("license", "key"), None),
+    ("language", ("language",), None),
+    ("stars", ("stargazers_count",), "q"),
+    ("forks", ("forks_count",), "q"),
+    ("size", ("size",), "q"),
+    ("fork", ("fork",), "b"),
+)
+_license_key = compile_path(("license", "key"), None)
+
+
+class RepoTable:
+    """Compact column-per-field copy of a repos payload, for querying
+    many repos without walking their dicts.
+    Text columns (name, license, language) are lists, with license keys
+    and languages interned; numeric columns (stars, forks, size) and the
+    fork flag are typed arrays. filter, sort and top_k return views
+    holding only a list of rows over the same columns, so queries chain
+    without copying any column.
+    Indexes are built lazily, once per table and shared by its views:
+    the rows of every license, language and fork flag, and the rows of
+    every numeric column by decreasing value. On the full table,
+    filter then costs about the rows it returns, and top_k only the k
+    rows it returns.
+    Example
+    -------
+    >>> table = RepoTable.from_repos(repos_payload)
+    >>> table.filter(license="apache-2.0").top_k("stars", 3).names
+    ['dagger', 'traceur-compiler', 'kratu']
+    """
+    __slots__ = ("columns", "rows", "_indexes")
+
+    def __init__(self, columns: Dict[str, Sequence],
+                 rows: Optional[List[int]] = None,
+                 _indexes: Optional[Dict[str, Any]] = None) -> None:
+        """Init method of RepoTable. rows selects and orders the rows of
+        columns in this view; None is every row, in payload order."""
+        self.columns = columns
+        self.rows = rows
+        self._indexes: Dict[str, Any] = {} if _indexes is None \
+            else _indexes
+
+    @classmethod
+    def from_repos(cls, repos: Iterable[Dict]) -> "RepoTable":
+        """Table of the REPO_COLUMNS fields of repos; missing text is
+        None and missing numbers are 0"""
+        values = pluck_many(repos, [path for _, path, _ in REPO_COLUMNS])
+        columns: Dict[str, Sequence] = {}
+        for (name, _, typecode), column in zip(REPO_COLUMNS, values):
+            if typecode is not None:
+                column = array(typecode, [value or 0 for value in column])
+            elif name != "name":
+                column = [sys.intern(value) if type(value) is str
+                          else value for value in column]
+            columns[name] = column
+        return cls(columns)
+
+    def __len__(self) -> int:
+        """Number of repos in the view"""
+        if self.rows is None:
+            return len(self.columns["name"])
+        return len(self.rows)
+
+    @property
+    def names(self) -> List[str]:
+        """Repo names, in view order"""
+        return list(self.column("name"))
+
+    def _values(self, name: str) -> Sequence:
+        """Whole column called name, in row order"""
+        try:
+            return self.columns[name]
+        except KeyError:
+            raise ValueError("unknown column {!r}, expected one of {}".format(
+                name, ", ".join(self.columns))) from None
+
+    def column(self, name: str) -> Sequence:
+        """Values of the column called name, in view order"""
+        values = self._values(name)
+        if self.rows is None:
+            return values
+        return [values[row] for row in self.rows]
+
+    def _view(self, rows: List[int]) -> "RepoTable":
+        """View of the given rows of the columns"""
+        return type(self)(self.columns, rows, self._indexes)
+
+    def take(self, positions: Iterable[int]) -> "RepoTable":
+        """View of the rows at positions of this view, in that order"""
+        if self.rows is None:
+            return self._view(list(positions))
+        return self._view([self.rows[position] for position in positions])
+
+    def _rows_by_value(self, name: str) -> Dict[Any, List[int]]:
+        """Rows of every value of a text or flag column, in row order"""
+        key = "by_value:" + name
+        index = self._indexes.get(key)
+        if index is None:
+            index = {}
+            for row, value in enumerate(self.columns[name]):
+                index.setdefault(value, []).append(row)
+            self._indexes[key] = index
+        return index
+
+    def _descending(self, name: str) -> Tuple[List[int], array]:
+        """Rows of a numeric column by decreasing value, ties in row
+        order, along with the negated values in that order"""
+        key = "descending:" + name
+        order = self._indexes.get(key)
+        if order is None:
+            values = self.columns[name]
+            rows = sorted(range(len(values)), key=values.__getitem__,
+                          reverse=True)
+            order = self._indexes[key] = (
+                rows, array(values.typecode, [-values[row] for row in rows]))
+        return order
+
+    def license_rows(self, license: Union[str, Iterable[str]]
+                     ) -> List[int]:
+        """Rows of the repos with license, or any of several licenses,
+        in row order"""
+        by_license = self._rows_by_value("license")
+        if isinstance(license, str):
+            return list(by_license.get(license, ()))
+        return list(heapq.merge(*(by_license.get(key, ())
+                                  for key in set(license))))
+
+    def filter(self, license: Union[str, Iterable[str]] = None,
+               language: Optional[str] = None, fork: Optional[bool] = None,
+               min_stars: Optional[int] = None) -> "RepoTable":
+        """View of the repos matching every given criterion, in view
+        order"""
+        checks = []
+        if language is not None:
+            languages = self.columns["language"]
+            checks.append(lambda row: languages[row] == language)
+        if fork is not None:
+            forks = self.columns["fork"]
+            checks.append(lambda row: bool(forks[row]) is fork)
+        if min_stars is not None:
+            stars = self.columns["stars"]
+            checks.append(lambda row: stars[row] >= min_stars)
+        if license is not None:
+            licenses = self.columns["license"]
+            keys = {license} if isinstance(license, str) else set(license)
+            checks.append(lambda row: licenses[row] in keys)
+        if self.rows is not None:
+            return self._view([row for row in self.rows
+                               if all(check(row) for check in checks)])
+        # start from the smallest set of candidates an index gives, and
+        # check the other criteria on those rows only
+        candidates = [range(len(self))]
+        if license is not None:
+            candidates.append(self.license_rows(license))
+        if language is not None:
+            candidates.append(self._rows_by_value("language")
+                              .get(language, ()))
+        if fork is not None:
+            by_fork = self._rows_by_value("fork")
+            candidates.append(by_fork.get(int(fork), ()))
+        if min_stars is not None:
+            rows, negated = self._descending("stars")
+            candidates.append(sorted(
+                rows[:bisect_right(negated, -min_stars)]))
+        rows = min(candidates, key=len)
+        return self._view([row for row in rows
+                           if all(check(row) for check in checks)])
+
+    def sort(self, column: str, reverse: bool = False) -> "RepoTable":
+        """View sorted by column; ties keep view order, and missing
+        text sorts last"""
+        values = self._values(column)
+        rows = range(len(self)) if self.rows is None else self.rows
+        if isinstance(values, array):
+            key = values.__getitem__
+        else:
+            def key(row: int) -> Tuple[bool, str]:
+                """Sort key of a text value that may be None"""
+                return (values[row] is None) is not reverse, \
+                    values[row] or ""
+        return self._view(sorted(rows, key=key, reverse=reverse))
+
+    def top_k(self, column: str, k: int) -> "RepoTable":
+        """View of the k repos with the largest values of a numeric
+        column, largest first; ties keep view order"""
+        values = self._values(column)
+        if not isinstance(values, array):
+            raise ValueError("top_k needs a numeric column, not {!r}"
+                             .format(column))
+        if self.rows is None:
+            return self._view(self._descending(column)[0][:k])
+        return self._view(heapq.nlargest(k, self.rows,
+                                         key=values.__getitem__))
+
+    def records(self) -> Iterator[Dict[str, Any]]:
+        """Yield every row of the view as a dict of column values"""
+        rows = range(len(self)) if self.rows is None else self.rows
+        for row in rows:
+            record = {name: values[row]
+                      for name, values in self.columns.items()}
+            record["fork"] = bool(record["fork"])
+            yield record
+
+
+class OrgRegistry:
+    """Process-wide cache of the org and repos payloads fetched by
+    GithubOrgClient objects, so that clients created for the same org
+    share one fetch.
+    Entries are keyed by org URL and expire ttl seconds after they are
+    fetched; once maxsize entries are held the least recently used is
+    evicted.
+    Parameters
+    ----------
+    maxsize: int
+        Number of payloads kept (an org and its repos count as two)
+    ttl: float
+        Time to live of an entry, in seconds
+    Attributes
+    ----------
+    hits: int
+        Lookups answered with a live entry
+    misses: int
+        Lookups that found none, or an expired one
+    Example
+    -------
+    >>> GithubOrgClient.registry = OrgRegistry(maxsize=1024, ttl=60)
+    """
+
+    def __init__(self, maxsize: int = 512, ttl: float = 300.0) -> None:
+        """Init method of OrgRegistry"""
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[Any, float]]" \
+            = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """Number of cached payloads"""
+        return len(self._entries)
+
+    def lookup(self, org_url: str, field: str) -> Optional[Any]:
+        """Live payload cached for field of the org at org_url"""
+        key = (org_url, field)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[1] <= time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def store(self, org_url: str, field: str, value: Any) -> None:
+        """Cache value for field of the org at org_url, evicting the
+        least recently used entries"""
+        key = (org_url, field)
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, org_url: str) -> None:
+        """Forget every payload of the org at org_url"""
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == org_url]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        """Drop every entry and reset the counters"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Counters and size of the registry"""
+        return {"hits": self.hits, "misses": self.misses, "size": len(self)}
+
 
 class GithubOrgClient:
     """A Githib org client
+    Instances have no __dict__: memoized values live in the slots
+    named after the memoized properties, which keeps the many
+    short-lived clients of a server process small. __weakref__ lets
+    amemoize track the requests in progress for each client.
     """
+    __slots__ = ("_org_name", "_pool", "_org", "_repos_payload",
+                 "_license_index", "_repo_table", "__weakref__")
+
     ORG_URL = "https://api.github.com/orgs/{org}"
+    PAGE_WORKERS = 8
+    # OrgRegistry shared by every client, None to fetch per instance
+    registry: Optional[OrgRegistry] = None
 
-    def __init__(self, org_name: str) -> None:
+    def __init__(self, org_name: str,
+                 pool: Optional[AsyncJSONClient] = None) -> None:
         """Init method of GithubOrgClient"""
         self._org_name = org_name
+        self._pool = pool
+        self._license_index: Optional[Tuple[List[Dict], List[str],
+                                            Dict[str, List[int]]]] = None
+        # (payload the table was built from, or None once dropped, table)
+        self._repo_table: Optional[Tuple[Optional[List[Dict]],
+                                         RepoTable]] = None
+
+    @property
+    def _org_url(self) -> str:
+        """URL of the org"""
+        return self.ORG_URL.format(org=self._org_name)
+
+    def _shared(self, field: str, fetch: Callable[[], Any]) -> Any:
+        """field from the registry, or fetched and registered"""
+        registry = self.registry
+        if registry is None:
+            return fetch()
+        value = registry.lookup(self._org_url, field)
+        if value is None:
+            value = fetch()
+            registry.store(self._org_url, field, value)
+        return value
+
+    async def _ashared(self, field: str,
+                       fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """field from the registry, or awaited and registered"""
+        registry = self.registry
+        if registry is None:
+            return await fetch()
+        value = registry.lookup(self._org_url, field)
+        if value is None:
+            value = await fetch()
+            registry.store(self._org_url, field, value)
+        return value
 
     @memoize
     def org(self) -> Dict:
         """Memoize org"""
-        return get_json(self.ORG_URL.format(org=self._org_name))
+        return self._shared("org", lambda: get_json(self._org_url))
 
     @property
     def _public_repos_url(self) -> str:
@@ -34,25 +392,166 @@ class GithubOrgClient:
 
     @memoize
     def repos_payload(self) -> Dict:
-        """Memoize repos payload"""
-        return get_json(self._public_repos_url)
+        """Memoize repos payload, with the repos of every page"""
+        return self._shared("repos_payload", lambda: [
+            repo for page in self.iter_repos_pages() for repo in page])
+
+    def iter_repos_pages(self, max_workers: Optional[int] = None
+                         ) -> Iterator[List[Dict]]:
+        """Yield every page of repos, in page order.
+        Once the first page tells the number of the last page, the
+        remaining pages are fetched concurrently by at most max_workers
+        (PAGE_WORKERS by default) threads. Without a "last" link, "next"
+        links are followed one by one.
+        """
+        page, links = get_json_page(self._public_repos_url)
+        yield page
+        if "last" not in links:
+            while "next" in links:
+                page, links = get_json_page(links["next"])
+                yield page
+            return
+        urls = self._page_urls(links["last"])
+        with ThreadPoolExecutor(max_workers or self.PAGE_WORKERS) as pool:
+            futures = [pool.submit(get_json_page, url) for url in urls]
+            try:
+                for future in futures:
+                    yield future.result()[0]
+            finally:
+                for future in futures:
+                    future.cancel()
 
-    def public_repos(self, license: str = None) -> List[str]:
-        """Public repos"""
-        json_payload = self.repos_payload
-        public_repos = [
-            repo["name"] for repo in json_payload
-            if license is None or self.has_license(repo, license)
-        ]
+    @staticmethod
+    def _page_urls(last_url: str) -> List[str]:
+        """URLs of pages 2 to last, built from the URL of the last page"""
+        parts = urlsplit(last_url)
+        query = dict(parse_qsl(parts.query))
+        urls = []
+        for number in range(2, int(query.get("page", 1)) + 1):
+            query["page"] = str(number)
+            urls.append(urlunsplit(parts._replace(query=urlencode(query))))
+        return urls
 
-        return public_repos
+    @amemoize(name="org")
+    async def aorg(self) -> Dict:
+        """Async memoize org, shared with org"""
+        return await self._ashared(
+            "org", lambda: aget_json(self._org_url, self._pool))
+
+    @amemoize(name="repos_payload")
+    async def arepos_payload(self) -> Dict:
+        """Async memoize repos payload, shared with repos_payload.
+        As in iter_repos_pages, at most PAGE_WORKERS pages are fetched
+        at once."""
+        return await self._ashared("repos_payload", self._afetch_repos)
+
+    async def _afetch_repos(self) -> List[Dict]:
+        """Fetch the repos of every page"""
+        org = await self.aorg
+        page, links = await aget_json_page(org["repos_url"], self._pool)
+        pages = [page]
+        if "last" in links:
+            limit = asyncio.Semaphore(self.PAGE_WORKERS)
+
+            async def fetch_page(url: str) -> List[Dict]:
+                async with limit:
+                    return (await aget_json_page(url, self._pool))[0]
+
+            pages += await asyncio.gather(*(
+                fetch_page(url) for url in self._page_urls(links["last"])))
+        else:
+            while "next" in links:
+                page, links = await aget_json_page(links["next"], self._pool)
+                pages.append(page)
+        return [repo for page in pages for repo in page]
+
+    @classmethod
+    async def afetch_many(
+            cls, org_names: Iterable[str],
+            pool: Optional[AsyncJSONClient] = None
+    ) -> List["GithubOrgClient"]:
+        """Clients for org_names with org and repos_payload fetched
+        concurrently over one connection pool"""
+        clients = [cls(org_name, pool) for org_name in org_names]
+        await asyncio.gather(*(c.arepos_payload for c in clients))
+        return clients
+
+    def public_repos(self, license: Union[str, Iterable[str]] = None
+                     ) -> List[str]:
+        """Public repos, in payload order.
+        license is one license key or several; a repo matches when it
+        has any of them. Matches come from an index of the payload by
+        license key, built on the first query and rebuilt when
+        repos_payload changes, so a query only costs the repos it
+        returns. After drop_repos_payload, repo_table answers instead.
+        """
+        table = self._dropped_table()
+        if table is not None:
+            names = table.columns["name"]
+            if license is None:
+                return list(names)
+            return [names[row] for row in table.license_rows(license)]
+        names, by_license = self._repos_by_license()
+        if license is None:
+            return list(names)
+        if isinstance(license, str):
+            return [names[i] for i in by_license.get(license, ())]
+        positions = heapq.merge(*(by_license.get(key, ())
+                                  for key in set(license)))
+        return [names[i] for i in positions]
+
+    def _repos_by_license(self) -> Tuple[List[str], Dict[str, List[int]]]:
+        """Repo names, and the positions of the repos of every license
+        key, for the current repos_payload"""
+        payload = self.repos_payload
+        index = self._license_index
+        if index is None or index[0] is not payload:
+            names = [repo["name"] for repo in payload]
+            by_license: Dict[str, List[int]] = {}
+            for position, key in enumerate(pluck(payload,
+                                                 ("license", "key"))):
+                if key is not None:
+                    by_license.setdefault(key, []).append(position)
+            index = self._license_index = (payload, names, by_license)
+        return index[1], index[2]
+
+    @property
+    def repo_table(self) -> RepoTable:
+        """RepoTable of repos_payload, built on first use and rebuilt
+        when repos_payload changes. After drop_repos_payload, the table
+        is kept until repos_payload is read again."""
+        table = self._dropped_table()
+        if table is not None:
+            return table
+        entry = self._repo_table
+        payload = self.repos_payload
+        if entry is None or entry[0] is not payload:
+            entry = self._repo_table = (payload,
+                                        RepoTable.from_repos(payload))
+        return entry[1]
+
+    def _dropped_table(self) -> Optional[RepoTable]:
+        """repo_table, if it outlives a dropped repos_payload"""
+        entry = self._repo_table
+        if entry is not None and entry[0] is None and \
+                getattr(self, "_repos_payload", None) is None:
+            return entry[1]
+        return None
+
+    def drop_repos_payload(self) -> RepoTable:
+        """Keep only repo_table, releasing the raw repos payload so that
+        a cached org costs the size of its table. public_repos keeps
+        answering from the table; reading repos_payload fetches it
+        again. The payload is only freed once nothing else, such as an
+        OrgRegistry, holds it."""
+        table = self.repo_table
+        GithubOrgClient.repos_payload.invalidate(self)
+        self._license_index = None
+        self._repo_table = (None, table)
+        return table
 
     @staticmethod
     def has_license(repo: Dict[str, Dict], license_key: str) -> bool:
         """Static: has_license"""
         assert license_key is not None, "license_key cannot be None"
-        try:
-            has_license = access_nested_map(repo, ("license", "key")) == license_key
-        except KeyError:
-            return False
-        return has_license
+        return _license_key(repo) == license_key
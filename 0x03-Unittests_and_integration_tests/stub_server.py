@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""A local stand-in for the GitHub API, so that tests and benchmarks
+of the HTTP code paths run offline.
+"""
+import hashlib
+import json
+import threading
+import time
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+from typing import (
+    Any,
+    Dict,
+    Optional,
+)
+
+__all__ = [
+    "StubServer",
+]
+
+
+class _ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+    """HTTPServer handling every connection in its own thread
+    """
+    daemon_threads = True
+    request_queue_size = 128
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Serve the JSON routes registered on the StubServer
+    """
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def setup(self) -> None:
+        """Count every new connection"""
+        super().setup()
+        self.server.stub._count("connections")
+
+    def do_GET(self) -> None:
+        """Answer with the registered payload, or 404"""
+        stub = self.server.stub
+        stub._count("requests")
+        route = stub.routes.get(self.path)
+        if route is None:
+            self._send(404, b'{"message": "Not Found"}', {})
+            return
+        body, headers = route
+        if self.headers.get("If-None-Match") == headers["ETag"] or \
+                self.headers.get("If-Modified-Since") == \
+                headers["Last-Modified"]:
+            stub._count("not_modified")
+            self._send(304, b"", headers)
+            return
+        self._send(200, body, headers)
+
+    def _send(self, status: int, body: bytes,
+              headers: Dict[str, str]) -> None:
+        """Write a complete response, keeping the connection open"""
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args: Any) -> None:
+        """Keep test output quiet"""
+
+
+class StubServer:
+    """Keep-alive HTTP/1.1 server on 127.0.0.1 answering GET requests
+    with registered JSON payloads, and counting connections and
+    requests so tests can check connection reuse. Payloads carry an
+    ETag and a Last-Modified header, and matching conditional requests
+    are answered with 304 Not Modified.
+    Example
+    -------
+    >>> with StubServer() as server:
+    ...     server.add_json("/orgs/google", {"login": "google"})
+    ...     get_json(server.url + "/orgs/google")
+    {'login': 'google'}
+    """
+
+    def __init__(self) -> None:
+        """Init method of StubServer"""
+        self.routes: Dict[str, tuple] = {}
+        self.connections = 0
+        self.requests = 0
+        self.not_modified = 0
+        self._lock = threading.Lock()
+        self._epoch = int(time.time())
+        self._revision = 0
+        self._httpd: Optional[_ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """Base URL of the running server"""
+        host, port = self._httpd.server_address[:2]
+        return "http://{}:{}".format(host, port)
+
+    def add_json(self, path: str, payload: Any,
+                 headers: Optional[Dict[str, str]] = None) -> str:
+        """Serve payload as JSON at path and return its full URL.
+        Serving a new payload at the same path changes its ETag and
+        Last-Modified headers."""
+        body = json.dumps(payload).encode()
+        headers = dict(headers or {})
+        headers["ETag"] = '"{}"'.format(hashlib.sha1(body).hexdigest())
+        self._revision += 1
+        headers["Last-Modified"] = formatdate(
+            self._epoch + self._revision, usegmt=True)
+        self.routes[path] = (body, headers)
+        return self.url + path
+
+    def add_org(self, org_name: str, org_payload: Dict,
+                repos_payload: Any, per_page: Optional[int] = None,
+                last_link: bool = True) -> str:
+        """Serve an org and its repos the way the GitHub API does,
+        with repos_url pointing back at this server. With per_page, the
+        repos are split into pages linked by a Link header, which
+        leaves out rel="last" when last_link is False. Returns the
+        org URL template to use as GithubOrgClient.ORG_URL.
+        """
+        repos_path = "/orgs/{}/repos".format(org_name)
+        org_payload = dict(org_payload, repos_url=self.url + repos_path)
+        self.add_json("/orgs/{}".format(org_name), org_payload)
+        if per_page is None:
+            self.add_json(repos_path, repos_payload)
+            return self.url + "/orgs/{org}"
+        pages = [repos_payload[start:start + per_page]
+                 for start in range(0, len(repos_payload), per_page)]
+        page_url = self.url + repos_path + "?page={}"
+        for number, page in enumerate(pages, 1):
+            links = []
+            if number < len(pages):
+                links.append('<{}>; rel="next"'.format(
+                    page_url.format(number + 1)))
+                if last_link:
+                    links.append('<{}>; rel="last"'.format(
+                        page_url.format(len(pages))))
+            headers = {"Link": ", ".join(links)} if links else {}
+            self.add_json("{}?page={}".format(repos_path, number), page,
+                          headers)
+            if number == 1:
+                self.add_json(repos_path, page, headers)
+        return self.url + "/orgs/{org}"
+
+    def reset_counters(self) -> None:
+        """Set the connection and request counters back to zero"""
+        with self._lock:
+            self.connections = 0
+            self.requests = 0
+            self.not_modified = 0
+
+    def _count(self, counter: str) -> None:
+        """Increment a counter from a handler thread"""
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def start(self) -> "StubServer":
+        """Start serving on a free port in a background thread"""
+        self._httpd = _ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        self._httpd.stub = self
+        self._thread = threading.Thread(target=self._httpd.serve_forever,
+                                        args=(0.05,), daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop serving and close the listening socket"""
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        self._thread.join()
+
+    def __enter__(self) -> "StubServer":
+        """Start the server"""
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        """Stop the server"""
+        self.stop()
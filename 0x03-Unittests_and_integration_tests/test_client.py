@@ -16,12 +16,18 @@ decorators to mock external calls and validate functionality.
 from fixtures import org_payload, repos_payload, expected_repos, apache2_repos
 """
 
+import asyncio
+import json
+import os
+import tempfile
 import unittest
 from unittest.mock import patch, PropertyMock, MagicMock
 from parameterized import parameterized, parameterized_class
-from client import GithubOrgClient
+from client import GithubOrgClient, OrgRegistry, RepoTable
 import requests
+import utils
 from fixtures import TEST_PAYLOAD
+from stub_server import StubServer
 
 
 class TestGithubOrgClient(unittest.TestCase):
@@ -69,7 +75,7 @@ class TestGithubOrgClient(unittest.TestCase):
                          "https://api.github.com/orgs/google/repos"
                          )
 
-    @patch('client.get_json')
+    @patch('client.get_json_page')
     @patch('client.GithubOrgClient._public_repos_url',
            new_callable=PropertyMock)
     def test_public_repos(self, mock_public_repos_url, mock_get_json):
@@ -80,16 +86,16 @@ class TestGithubOrgClient(unittest.TestCase):
         Args:
             mock_public_repos_url (MagicMock):
             Mocked _public_repos_url property.
-            mock_get_json (MagicMock): Mocked get_json method.
+            mock_get_json (MagicMock): Mocked get_json_page method.
         """
         mock_public_repos_url.return_value = {
                 "https://api.github.com/orgs/google/repos"
                 }
-        mock_get_json.return_value = [
+        mock_get_json.return_value = ([
             {"name": "repo1"},
             {"name": "repo2"},
             {"name": "repo3"},
-        ]
+        ], {})
 
         client = GithubOrgClient("google")
         result = client.public_repos()
@@ -119,6 +125,123 @@ class TestGithubOrgClient(unittest.TestCase):
         self.assertEqual(result, expected)
 
 
+@parameterized_class(('org_payload', 'repos_payload', 'expected_repos',
+                      'apache2_repos'), TEST_PAYLOAD)
+class TestRepoTable(unittest.TestCase):
+    """Unit tests for RepoTable against the fixture repos."""
+
+    def setUp(self):
+        """Build a table of the fixture repos."""
+        self.table = RepoTable.from_repos(self.repos_payload)
+
+    def test_columns(self):
+        """Test every row matches its repo."""
+        self.assertEqual(len(self.table), len(self.repos_payload))
+        self.assertEqual(self.table.names, self.expected_repos)
+        for record, repo in zip(self.table.records(), self.repos_payload):
+            self.assertEqual(record, {
+                "name": repo["name"],
+                "license": (repo["license"] or {}).get("key"),
+                "language": repo["language"],
+                "stars": repo["stargazers_count"],
+                "forks": repo["forks_count"],
+                "size": repo["size"],
+                "fork": repo["fork"],
+            })
+
+    def test_filter(self):
+        """Test filter keeps the repos matching every criterion."""
+        self.assertEqual(self.table.filter(license="apache-2.0").names,
+                         self.apache2_repos)
+        self.assertEqual(
+            self.table.filter(fork=False, min_stars=100).names,
+            [repo["name"] for repo in self.repos_payload
+             if not repo["fork"] and repo["stargazers_count"] >= 100])
+        self.assertEqual(
+            self.table.filter(license=["apache-2.0", "other"],
+                              language="JavaScript").names,
+            [repo["name"] for repo in self.repos_payload
+             if repo["language"] == "JavaScript" and
+             (repo["license"] or {}).get("key") in ("apache-2.0", "other")])
+
+    def test_filter_matches_scan(self):
+        """Test every combination of criteria, on the table and on a
+        sorted view, agrees with a scan of the payload."""
+        def matches(repo, license, language, fork, min_stars):
+            key = (repo["license"] or {}).get("key")
+            return (license is None or key in license) and \
+                (language is None or repo["language"] == language) and \
+                (fork is None or repo["fork"] is fork) and \
+                (min_stars is None or repo["stargazers_count"] >= min_stars)
+
+        by_name = sorted(self.repos_payload, key=lambda repo: repo["name"])
+        for license in (None, ["apache-2.0"], ["other", "bsl-1.0"]):
+            for language in (None, "JavaScript", "Go"):
+                for fork in (None, True, False):
+                    for min_stars in (None, 0, 100, 10 ** 6):
+                        criteria = (license, language, fork, min_stars)
+                        self.assertEqual(
+                            self.table.filter(*criteria).names,
+                            [repo["name"] for repo in self.repos_payload
+                             if matches(repo, *criteria)], criteria)
+                        self.assertEqual(
+                            self.table.sort("name").filter(*criteria).names,
+                            [repo["name"] for repo in by_name
+                             if matches(repo, *criteria)], criteria)
+
+    def test_views_share_columns(self):
+        """Test queries return views over the same columns."""
+        view = self.table.filter(fork=False).sort("forks", reverse=True)
+        self.assertIs(view.columns, self.table.columns)
+        self.assertEqual(view.top_k("stars", 2).names, [
+            repo["name"] for repo in sorted(
+                (repo for repo in self.repos_payload if not repo["fork"]),
+                key=lambda repo: -repo["stargazers_count"])[:2]])
+        self.assertEqual(view.take([0]).names, view.names[:1])
+
+    def test_sort_and_top_k(self):
+        """Test sort and top_k order rows by a column."""
+        by_stars = sorted(self.repos_payload,
+                          key=lambda repo: -repo["stargazers_count"])
+        self.assertEqual(self.table.sort("stars", reverse=True).names,
+                         [repo["name"] for repo in by_stars])
+        self.assertEqual(self.table.top_k("stars", 3).names,
+                         [repo["name"] for repo in by_stars[:3]])
+        self.assertEqual(self.table.sort("name").names,
+                         sorted(self.expected_repos))
+        licenses = list(self.table.sort("license").column("license"))
+        self.assertEqual(licenses[-1:], [None])
+        stars = self.table.sort("stars").column("stars")
+        self.assertEqual(list(stars), sorted(stars))
+        with self.assertRaises(ValueError):
+            self.table.top_k("name", 3)
+        with self.assertRaises(ValueError):
+            self.table.sort("owner")
+
+
+class TestOrgRegistry(unittest.TestCase):
+    """Unit tests for OrgRegistry."""
+
+    def test_lru_eviction(self):
+        """Test the least recently used payload is evicted."""
+        registry = OrgRegistry(maxsize=2)
+        registry.store("a", "org", {"login": "a"})
+        registry.store("b", "org", {"login": "b"})
+        registry.lookup("a", "org")
+        registry.store("c", "org", {"login": "c"})
+        self.assertIsNone(registry.lookup("b", "org"))
+        self.assertEqual(registry.lookup("a", "org"), {"login": "a"})
+        self.assertEqual(registry.stats, {"hits": 2, "misses": 1,
+                                          "size": 2})
+
+    def test_expiry(self):
+        """Test an expired payload is dropped on lookup."""
+        registry = OrgRegistry(ttl=0)
+        registry.store("a", "org", {"login": "a"})
+        self.assertIsNone(registry.lookup("a", "org"))
+        self.assertEqual(len(registry), 0)
+
+
 @parameterized_class(('org_payload', 'repos_payload', 'expected_repos',
                       'apache2_repos'), TEST_PAYLOAD)
 class TestIntegrationGithubOrgClient(unittest.TestCase):
@@ -127,19 +250,22 @@ class TestIntegrationGithubOrgClient(unittest.TestCase):
     @classmethod
     def setUpClass(cls):
         """Set up class for integration tests."""
-        cls.get_patcher = patch('requests.get')
+        cls.get_patcher = patch('requests.Session.get')
         cls.mock_get = cls.get_patcher.start()
 
         # Define the side_effect for different URLs
+        def response(payload, **kwargs):
+            return MagicMock(content=json.dumps(payload).encode(), **kwargs)
+
         def mock_requests_get(url, *args, **kwargs):
             if url.endswith('/orgs/google'):
-                return MagicMock(json=lambda: cls.org_payload)
+                return response(cls.org_payload, links={})
             if url.endswith('/orgs/google/repos'):
-                return MagicMock(json=lambda: cls.repos_payload)
+                return response(cls.repos_payload, links={})
             if url.endswith('/repos/google/repo1'):
-                return MagicMock(json=lambda: cls.expected_repos)
+                return response(cls.expected_repos)
             if url.endswith('/repos/google/repo2'):
-                return MagicMock(json=lambda: cls.apache2_repos)
+                return response(cls.apache2_repos)
             raise ValueError(f"Unhandled URL: {url}")
 
         cls.mock_get.side_effect = mock_requests_get
@@ -162,5 +288,255 @@ class TestIntegrationGithubOrgClient(unittest.TestCase):
         self.assertEqual(repos, self.apache2_repos)
 
 
+@parameterized_class(('org_payload', 'repos_payload', 'expected_repos',
+                      'apache2_repos'), TEST_PAYLOAD)
+class TestPaginatedGithubOrgClient(unittest.TestCase):
+    """Integration tests for repos pagination against a local
+    stub server."""
+
+    def setUp(self):
+        """Start a stub server."""
+        self.server = StubServer().start()
+        self.addCleanup(self.server.stop)
+
+    def serve(self, **kwargs):
+        """Serve the fixtures for google and point the client at them."""
+        org_url = self.server.add_org(
+            "google", self.org_payload, self.repos_payload, **kwargs)
+        patcher = patch.object(GithubOrgClient, 'ORG_URL', org_url)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    @parameterized.expand([
+        ("last_link", True),
+        ("next_links_only", False),
+    ])
+    def test_public_repos_every_page(self, _, last_link):
+        """Test public_repos returns the repos of every page in order."""
+        self.serve(per_page=2, last_link=last_link)
+        client = GithubOrgClient("google")
+        self.assertEqual(client.public_repos(), self.expected_repos)
+        self.assertEqual(client.public_repos(license="apache-2.0"),
+                         self.apache2_repos)
+        pages = -(-len(self.repos_payload) // 2)
+        self.assertEqual(self.server.requests, 1 + pages)
+
+    def test_public_repos_from_disk_cache(self):
+        """Test a cold process serves public_repos from DiskCache."""
+        self.serve(per_page=4)
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        path = os.path.join(tmpdir.name, "cache.sqlite")
+        self.addCleanup(utils.set_cache, None)
+        warm = utils.DiskCache(path)
+        utils.set_cache(warm)
+        GithubOrgClient("google").public_repos()
+        warm.close()
+        self.server.reset_counters()
+
+        cold = utils.DiskCache(path)
+        self.addCleanup(cold.close)
+        utils.set_cache(cold)
+        client = GithubOrgClient("google")
+        self.assertEqual(client.public_repos(), self.expected_repos)
+        self.assertEqual(self.server.requests, 0)
+
+    def test_public_repos_several_licenses(self):
+        """Test public_repos matches any of several licenses, in
+        payload order, and follows a refreshed payload."""
+        self.serve()
+        client = GithubOrgClient("google")
+        licenses = ["bsd-3-clause", "apache-2.0", "missing"]
+        self.assertEqual(client.public_repos(licenses), [
+            repo["name"] for repo in self.repos_payload
+            if any(client.has_license(repo, key) for key in licenses)])
+        self.assertEqual(client.public_repos(["apache-2.0"]),
+                         self.apache2_repos)
+        self.assertEqual(client.public_repos("missing"), [])
+
+        self.server.add_org("google", self.org_payload,
+                            self.repos_payload[:3])
+        GithubOrgClient.repos_payload.invalidate(client)
+        self.assertEqual(client.public_repos("apache-2.0"), [
+            repo["name"] for repo in self.repos_payload[:3]
+            if client.has_license(repo, "apache-2.0")])
+
+    def test_public_repos_without_table(self):
+        """Test public_repos never builds repo_table, so fields it does
+        not read may hold anything."""
+        repos = [dict(repo, stargazers_count="many", language=1)
+                 for repo in self.repos_payload]
+        self.server.add_org("odd", self.org_payload, repos)
+        self.serve()
+        client = GithubOrgClient("odd")
+        self.assertEqual(client.public_repos(), self.expected_repos)
+        self.assertEqual(client.public_repos("apache-2.0"),
+                         self.apache2_repos)
+        self.assertIsNone(client._repo_table)
+
+    def test_drop_repos_payload(self):
+        """Test public_repos answers from repo_table once the payload
+        is dropped, until repos_payload is read again."""
+        self.serve()
+        client = GithubOrgClient("google")
+        table = client.drop_repos_payload()
+        self.assertFalse(hasattr(client, "_repos_payload"))
+        requests_made = self.server.requests
+        self.assertEqual(client.public_repos(), self.expected_repos)
+        self.assertEqual(client.public_repos("apache-2.0"),
+                         self.apache2_repos)
+        self.assertIs(client.repo_table, table)
+        self.assertEqual(self.server.requests, requests_made)
+
+        self.server.add_org("google", self.org_payload,
+                            self.repos_payload[:2])
+        client.repos_payload
+        self.assertEqual(client.public_repos(), self.expected_repos[:2])
+
+    def test_registry_shared_across_clients(self):
+        """Test clients of the same org share the registry's payloads
+        until they expire."""
+        self.serve(per_page=4)
+        registry = OrgRegistry(ttl=60)
+        with patch.object(GithubOrgClient, 'registry', registry):
+            first = GithubOrgClient("google")
+            self.assertEqual(first.public_repos(), self.expected_repos)
+            requests_made = self.server.requests
+            for _ in range(5):
+                client = GithubOrgClient("google")
+                self.assertIs(client.org, first.org)
+                self.assertIs(client.repos_payload, first.repos_payload)
+            self.assertEqual(self.server.requests, requests_made)
+            registry.ttl = 0
+            registry.invalidate(first._org_url)
+            GithubOrgClient("google").org
+            GithubOrgClient("google").org
+        self.assertEqual(self.server.requests, requests_made + 2)
+        self.assertEqual(registry.stats["hits"], 10)
+
+    def test_iter_repos_pages(self):
+        """Test iter_repos_pages streams pages in page order."""
+        self.serve(per_page=4)
+        pages = list(GithubOrgClient("google").iter_repos_pages(2))
+        self.assertEqual([len(page) for page in pages], [4, 4, 1])
+        self.assertEqual([repo for page in pages for repo in page],
+                         self.repos_payload)
+
+
+@unittest.skipIf(utils.aiohttp is None, "aiohttp is not installed")
+@parameterized_class(('org_payload', 'repos_payload', 'expected_repos',
+                      'apache2_repos'), TEST_PAYLOAD)
+class TestAsyncGithubOrgClient(unittest.IsolatedAsyncioTestCase):
+    """Integration tests for the async GithubOrgClient methods
+    against a local stub server."""
+
+    def setUp(self):
+        """Serve the fixtures for several orgs, one of them paginated."""
+        self.server = StubServer().start()
+        self.addCleanup(self.server.stop)
+        self.org_names = ["org{}".format(i) for i in range(8)]
+        for org_name in self.org_names:
+            org_url = self.server.add_org(
+                org_name, self.org_payload, self.repos_payload)
+        self.server.add_org("paged", self.org_payload, self.repos_payload,
+                            per_page=2)
+        patcher = patch.object(GithubOrgClient, 'ORG_URL', org_url)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    async def test_registry_shared_with_async_clients(self):
+        """Test async clients fill and reuse the registry."""
+        registry = OrgRegistry()
+        async with utils.AsyncJSONClient() as pool:
+            with patch.object(GithubOrgClient, 'registry', registry):
+                await GithubOrgClient.afetch_many(self.org_names, pool)
+                requests_made = self.server.requests
+                clients = await GithubOrgClient.afetch_many(
+                    self.org_names, pool)
+                self.assertEqual(clients[0].public_repos(),
+                                 self.expected_repos)
+        self.assertEqual(self.server.requests, requests_made)
+        self.assertEqual(len(registry), 2 * len(self.org_names))
+
+    async def test_amemoize_into_slots(self):
+        """Test aorg and arepos_payload fill the slots of a client
+        without a __dict__."""
+        async with utils.AsyncJSONClient() as pool:
+            client = GithubOrgClient(self.org_names[0], pool)
+            await client.arepos_payload
+        self.assertFalse(hasattr(client, "__dict__"))
+        self.assertEqual(client._repos_payload, self.repos_payload)
+        self.assertIs(client.org, client._org)
+
+    async def test_afetch_many(self):
+        """Test afetch_many fetches every org over a shared pool."""
+        async with utils.AsyncJSONClient(pool_size=2) as pool:
+            clients = await GithubOrgClient.afetch_many(
+                self.org_names, pool)
+        self.assertEqual(self.server.requests, 2 * len(self.org_names))
+        self.assertLessEqual(self.server.connections, 2)
+        for client in clients:
+            self.assertEqual(client.public_repos(), self.expected_repos)
+            self.assertEqual(client.public_repos(license="apache-2.0"),
+                             self.apache2_repos)
+
+    async def test_aorg_is_memoized(self):
+        """Test concurrent awaits of aorg share a single request and
+        feed the org property."""
+        async with utils.AsyncJSONClient() as pool:
+            client = GithubOrgClient(self.org_names[0], pool)
+            orgs = await asyncio.gather(*(client.aorg for _ in range(1000)))
+            self.assertIs(await client.aorg, orgs[0])
+        self.assertTrue(all(org is orgs[0] for org in orgs))
+        self.assertIs(client.org, orgs[0])
+        self.assertEqual(self.server.requests, 1)
+
+    async def test_aorg_cancellation(self):
+        """Test a cancelled awaiter does not cancel the shared fetch."""
+        async with utils.AsyncJSONClient() as pool:
+            client = GithubOrgClient(self.org_names[0], pool)
+            cancelled = asyncio.ensure_future(client.aorg)
+            survivor = client.aorg
+            await asyncio.sleep(0)
+            cancelled.cancel()
+            org = await survivor
+        self.assertEqual(org["repos_url"],
+                         self.server.url + "/orgs/org0/repos")
+        self.assertEqual(self.server.requests, 1)
+
+    async def test_arepos_payload_every_page(self):
+        """Test arepos_payload gathers the repos of every page."""
+        async with utils.AsyncJSONClient() as pool:
+            client = GithubOrgClient("paged", pool)
+            repos = await client.arepos_payload
+        self.assertEqual(repos, self.repos_payload)
+        self.assertEqual(client.public_repos(), self.expected_repos)
+
+    async def test_arepos_payload_caps_concurrency(self):
+        """Test arepos_payload keeps at most PAGE_WORKERS pages in
+        flight."""
+        self.server.add_org("single", self.org_payload, self.repos_payload,
+                            per_page=1)
+        in_flight = []
+        peak = []
+
+        async def counting(url, pool=None):
+            in_flight.append(url)
+            peak.append(len(in_flight))
+            try:
+                await asyncio.sleep(0.01)
+                return await utils.aget_json_page(url, pool)
+            finally:
+                in_flight.remove(url)
+
+        async with utils.AsyncJSONClient() as pool:
+            client = GithubOrgClient("single", pool)
+            with patch.object(GithubOrgClient, 'PAGE_WORKERS', 2), \
+                    patch('client.aget_json_page', side_effect=counting):
+                repos = await client.arepos_payload
+        self.assertEqual(repos, self.repos_payload)
+        self.assertEqual(max(peak), 2)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -3,10 +3,28 @@
 Unit tests for utils.py
 """
 
+import asyncio
+import gc
+import json
+import os
+import tempfile
+import threading
+import time
+import types
 import unittest
+import warnings
 from unittest.mock import patch, Mock
 from parameterized import parameterized
-from utils import access_nested_map, get_json, memoize
+from stub_server import StubServer
+import utils
+from utils import (
+    AsyncJSONClient, DiskCache, ResponseCache, access_nested_map,
+    aclose_json_client, aget_json, amemoize, compile_path, get_json,
+    get_json_page, get_json_backend, get_json_projected, iter_json_array,
+    loads_json, make_session, memoize, pluck, pluck_many, project,
+    set_json_backend
+)
+from fixtures import TEST_PAYLOAD
 
 
 class TestAccessNestedMap(unittest.TestCase):
@@ -38,6 +56,95 @@ class TestAccessNestedMap(unittest.TestCase):
             access_nested_map(nested_map, path)
 
 
+class TestCompilePath(unittest.TestCase):
+    """
+    Test cases for compile_path getters
+    """
+    @parameterized.expand([
+        ({"a": 1}, ("a",), 1),
+        ({"a": {"b": 2}}, ("a",), {"b": 2}),
+        ({"a": {"b": 2}}, ("a", "b"), 2),
+        ({"a": {"b": {"c": 3}}}, ["a", "b", "c"], 3),
+        (types.MappingProxyType({"a": {"b": 2}}), ("a", "b"), 2),
+        ({"a": types.MappingProxyType({"b": 2})}, ("a", "b"), 2),
+    ])
+    def test_compile_path(self, nested_map, path, expected):
+        """
+        Test getters agree with access_nested_map
+        """
+        self.assertEqual(compile_path(path)(nested_map), expected)
+        self.assertEqual(compile_path(path)(nested_map),
+                         access_nested_map(nested_map, path))
+
+    @parameterized.expand([
+        ({}, ("a",), "a"),
+        ({"a": 1}, ("a", "b"), "b"),
+        ({"a": None}, ("a", "b"), "b"),
+        ({"a": {"b": 1}}, ("a", "b", "c"), "c"),
+        (types.MappingProxyType({}), ("a", "b"), "a"),
+    ])
+    def test_compile_path_missing(self, nested_map, path, key):
+        """
+        Test a missing key raises KeyError, or returns the default
+        """
+        with self.assertRaises(KeyError) as cm:
+            compile_path(path)(nested_map)
+        self.assertEqual(cm.exception.args, (key,))
+        self.assertIsNone(compile_path(path, None)(nested_map))
+        self.assertEqual(compile_path(path, [])(nested_map), [])
+
+    def test_compile_path_equal_defaults(self):
+        """
+        Test defaults that compare equal keep their own type
+        """
+        for first, second in ((0, False), (1, True), (0, 0.0)):
+            self.assertIs(compile_path(("x",), first)({}), first)
+            self.assertIs(compile_path(("x",), second)({}), second)
+        pluck([{}], ("x",), 0)
+        self.assertIs(pluck([{}], ("x",), False)[0], False)
+
+    def test_compile_path_cached(self):
+        """
+        Test getters are reused per path and default
+        """
+        self.assertIs(compile_path(["a", "b"]), compile_path(("a", "b")))
+        self.assertIsNot(compile_path(("a", "b")),
+                         compile_path(("a", "b"), None))
+
+
+class TestPluck(unittest.TestCase):
+    """
+    Test cases for pluck and pluck_many
+    """
+    RECORDS = [
+        {"name": "a", "license": {"key": "mit"}, "owner": {"login": "x"}},
+        {"name": "b", "license": None, "owner": {"login": "y"}},
+        {"name": "c", "owner": {}},
+    ]
+
+    def test_pluck(self):
+        """
+        Test one path is read from every record, default if missing
+        """
+        self.assertEqual(pluck(self.RECORDS, ("license", "key")),
+                         ["mit", None, None])
+        self.assertEqual(pluck(iter(self.RECORDS), ("owner", "login"), ""),
+                         ["x", "y", ""])
+        self.assertEqual(pluck([], ("name",)), [])
+
+    def test_pluck_many(self):
+        """
+        Test several paths come back as columns, in record order
+        """
+        paths = [("name",), ("license", "key"), ("owner", "login")]
+        self.assertEqual(pluck_many(iter(self.RECORDS), paths), [
+            ["a", "b", "c"], ["mit", None, None], ["x", "y", None]])
+        self.assertEqual(pluck_many([], paths), [[], [], []])
+        repos = TEST_PAYLOAD[0][1]
+        self.assertEqual(pluck_many(repos, paths),
+                         [pluck(repos, path) for path in paths])
+
+
 class TestGetJson(unittest.TestCase):
     """
     Test cases for get_json function
@@ -46,18 +153,452 @@ class TestGetJson(unittest.TestCase):
         ("http://example.com", {"payload": True}),
         ("http://holberton.io", {"payload": False}),
     ])
-    @patch('utils.requests.get')
+    @patch('utils.requests.Session.get')
     def test_get_json(self, url, payload, mock_get):
         """
         Test get_json returns expected result
         """
-        mock_response = Mock()
-        mock_response.json.return_value = payload
+        mock_response = Mock(content=json.dumps(payload).encode())
         mock_get.return_value = mock_response
 
         self.assertEqual(get_json(url), payload)
         mock_get.assert_called_once_with(url)
 
+    def test_get_json_injected_session(self):
+        """
+        Test get_json uses the session it is given
+        """
+        session = Mock()
+        session.get.return_value.content = b'{"payload": true}'
+        url = "http://example.com"
+
+        self.assertEqual(get_json(url, session), {"payload": True})
+        session.get.assert_called_once_with(url)
+
+
+class TestJsonBackend(unittest.TestCase):
+    """
+    Test cases for the pluggable JSON decoder
+    """
+    def setUp(self):
+        """
+        Restore the default backend after each test
+        """
+        self.addCleanup(set_json_backend)
+
+    def test_default_backend(self):
+        """
+        Test the fastest installed backend is picked by default
+        """
+        expected = "orjson" if utils.orjson else \
+            "ujson" if utils.ujson else "json"
+        self.assertEqual(set_json_backend(), expected)
+        self.assertEqual(get_json_backend(), expected)
+
+    @parameterized.expand([(name,) for name in utils.JSON_BACKENDS])
+    def test_backend_decodes_bytes(self, name):
+        """
+        Test every installed backend decodes the same payload, both
+        directly and through get_json
+        """
+        if getattr(utils, name) is None:
+            with self.assertRaises(RuntimeError):
+                set_json_backend(name)
+            return
+        self.assertEqual(set_json_backend(name), name)
+        payload = TEST_PAYLOAD[0][1]
+        body = json.dumps(payload, ensure_ascii=False).encode()
+        self.assertEqual(loads_json(body), payload)
+        with StubServer() as server:
+            url = server.add_json("/repos", payload)
+            self.assertEqual(get_json(url), payload)
+
+    def test_unknown_backend(self):
+        """
+        Test an unknown backend name raises ValueError
+        """
+        with self.assertRaises(ValueError):
+            set_json_backend("yaml")
+
+
+class TestSession(unittest.TestCase):
+    """
+    Test cases for the pooled session behind get_json
+    """
+    def setUp(self):
+        """
+        Start a stub server and give get_json a fresh session
+        """
+        self.server = StubServer().start()
+        self.addCleanup(self.server.stop)
+        utils.set_session(None)
+        self.addCleanup(utils.set_session, None)
+
+    def test_make_session(self):
+        """
+        Test make_session mounts a pooled adapter that retries
+        """
+        session = make_session(pool_size=7, retries=5)
+        adapter = session.get_adapter("https://api.github.com")
+        self.assertEqual(adapter._pool_maxsize, 7)
+        self.assertEqual(adapter.max_retries.total, 5)
+
+    @parameterized.expand([
+        (True, 1),
+        (False, 10),
+    ])
+    def test_connection_reuse(self, keep_alive, connections):
+        """
+        Test get_json reuses one connection when keep-alive is on
+        """
+        url = self.server.add_json("/org", {"login": "google"})
+        utils.set_session(make_session(keep_alive=keep_alive))
+        for _ in range(10):
+            self.assertEqual(get_json(url), {"login": "google"})
+        self.assertEqual(self.server.requests, 10)
+        self.assertEqual(self.server.connections, connections)
+
+
+class TestResponseCache(unittest.TestCase):
+    """
+    Test cases for conditional requests through ResponseCache
+    """
+    def setUp(self):
+        """
+        Start a stub server
+        """
+        self.server = StubServer().start()
+        self.addCleanup(self.server.stop)
+        self.url = self.server.add_json("/org", {"login": "google"})
+
+    def test_not_modified_returns_cached_object(self):
+        """
+        Test a 304 answer returns the very object cached before
+        """
+        cache = ResponseCache()
+        first = get_json(self.url, cache=cache)
+        second = get_json(self.url, cache=cache)
+        self.assertIs(second, first)
+        self.assertEqual(self.server.requests, 2)
+        self.assertEqual(self.server.not_modified, 1)
+        self.assertEqual(cache.stats, {"hits": 1, "misses": 1,
+                                       "not_modified": 1, "size": 1})
+
+    def test_changed_payload_is_refetched(self):
+        """
+        Test a new payload at the same URL replaces the cached one
+        """
+        cache = ResponseCache()
+        get_json(self.url, cache=cache)
+        self.server.add_json("/org", {"login": "alphabet"})
+        self.assertEqual(get_json(self.url, cache=cache),
+                         {"login": "alphabet"})
+        self.assertEqual(self.server.not_modified, 0)
+        self.assertIs(get_json(self.url, cache=cache),
+                      get_json(self.url, cache=cache))
+
+    def test_links_are_cached(self):
+        """
+        Test get_json_page returns the cached Link header on a 304
+        """
+        link = '<{}/org?page=2>; rel="next"'.format(self.server.url)
+        url = self.server.add_json("/paged", [1], {"Link": link})
+        cache = ResponseCache()
+        get_json_page(url, cache=cache)
+        self.assertEqual(get_json_page(url, cache=cache),
+                         ([1], {"next": self.server.url + "/org?page=2"}))
+        self.assertEqual(cache.not_modified, 1)
+
+    def test_lru_eviction(self):
+        """
+        Test the least recently used URL is evicted past maxsize
+        """
+        urls = [self.server.add_json("/{}".format(i), i) for i in range(3)]
+        cache = ResponseCache(maxsize=2)
+        get_json(urls[0], cache=cache)
+        get_json(urls[1], cache=cache)
+        get_json(urls[0], cache=cache)
+        get_json(urls[2], cache=cache)
+        self.assertEqual(len(cache), 2)
+        self.assertIsNotNone(cache.lookup(urls[0]))
+        self.assertIsNone(cache.lookup(urls[1]))
+
+    def test_module_wide_cache(self):
+        """
+        Test set_cache makes get_json use a cache by default
+        """
+        cache = ResponseCache()
+        utils.set_cache(cache)
+        self.addCleanup(utils.set_cache, None)
+        get_json(self.url)
+        get_json(self.url)
+        self.assertEqual(cache.not_modified, 1)
+
+
+class TestProjection(unittest.TestCase):
+    """
+    Test cases for the streaming, projecting JSON parse
+    """
+    PATHS = [("name",), ("license", "key")]
+
+    @parameterized.expand([(1,), (3,), (64,), (1 << 20,)])
+    def test_iter_json_array(self, chunk_size):
+        """
+        Test elements decode the same whatever the chunk boundaries
+        """
+        payload = TEST_PAYLOAD[0][1] + [12345, -2.5e3, "\u00e9\u4e2d", None,
+                                        [1, [2]]]
+        body = json.dumps(payload, ensure_ascii=False).encode()
+        chunks = [body[i:i + chunk_size]
+                  for i in range(0, len(body), chunk_size)]
+        self.assertEqual(list(iter_json_array(chunks)), payload)
+
+    @parameterized.expand([
+        (b"{}",),
+        (b"[1, 2",),
+        (b"[1x]",),
+    ])
+    def test_iter_json_array_invalid(self, body):
+        """
+        Test non-arrays and truncated arrays raise ValueError
+        """
+        with self.assertRaises(ValueError):
+            list(iter_json_array([body]))
+
+    def test_project(self):
+        """
+        Test only the projected paths are kept, missing ones skipped
+        """
+        repo = {"name": "a", "license": {"key": "mit", "url": "u"},
+                "owner": {"login": "o"}}
+        self.assertEqual(project(repo, self.PATHS + [("missing", "x")]),
+                         {"name": "a", "license": {"key": "mit"}})
+        self.assertEqual(project({"name": "b", "license": None},
+                                 self.PATHS), {"name": "b"})
+
+    def test_get_json_projected(self):
+        """
+        Test a streamed repos payload matches the projected full one
+        """
+        repos = TEST_PAYLOAD[0][1]
+        with StubServer() as server:
+            url = server.add_json("/repos", repos)
+            self.assertEqual(
+                get_json_projected(url, self.PATHS, chunk_size=256),
+                [project(repo, self.PATHS) for repo in repos])
+
+
+class TestDiskCache(unittest.TestCase):
+    """
+    Test cases for the persistent DiskCache
+    """
+    def setUp(self):
+        """
+        Start a stub server and pick a fresh database file
+        """
+        self.server = StubServer().start()
+        self.addCleanup(self.server.stop)
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        self.path = os.path.join(tmpdir.name, "cache.sqlite")
+
+    def open_cache(self, **kwargs):
+        """
+        Open a DiskCache on the test database, closed on cleanup
+        """
+        cache = DiskCache(self.path, **kwargs)
+        self.addCleanup(cache.close)
+        return cache
+
+    def test_fresh_entry_served_without_network(self):
+        """
+        Test a new cache on the same file answers without any request
+        """
+        link = '<{}/next>; rel="next"'.format(self.server.url)
+        url = self.server.add_json("/org", {"login": "google"},
+                                   {"Link": link})
+        get_json(url, cache=self.open_cache())
+        session = Mock()
+        self.assertEqual(
+            get_json_page(url, session, self.open_cache()),
+            ({"login": "google"}, {"next": self.server.url + "/next"}))
+        session.get.assert_not_called()
+        self.assertEqual(self.server.requests, 1)
+
+    def test_expired_entry_is_revalidated(self):
+        """
+        Test an entry past its TTL is revalidated with the server
+        """
+        url = self.server.add_json("/org", {"login": "google"})
+        cache = self.open_cache(ttl=0)
+        get_json(url, cache=cache)
+        self.assertEqual(get_json(url, cache=cache), {"login": "google"})
+        self.assertEqual(self.server.requests, 2)
+        self.assertEqual(cache.not_modified, 1)
+
+    def test_size_bound_evicts_least_recently_used(self):
+        """
+        Test entries are evicted once payloads exceed max_bytes
+        """
+        urls = [self.server.add_json("/{}".format(i), os.urandom(300).hex())
+                for i in range(3)]
+        cache = self.open_cache(max_bytes=1000)
+        get_json(urls[0], cache=cache)
+        get_json(urls[1], cache=cache)
+        get_json(urls[0], cache=cache)
+        get_json(urls[2], cache=cache)
+        self.assertEqual(len(cache), 2)
+        self.assertIsNotNone(cache.lookup(urls[0]))
+        self.assertIsNone(cache.lookup(urls[1]))
+
+    def test_maxsize_evicts_least_recently_used(self):
+        """
+        Test entries are evicted once there are more than maxsize
+        """
+        urls = [self.server.add_json("/{}".format(i), i) for i in range(3)]
+        cache = self.open_cache(maxsize=2)
+        get_json(urls[0], cache=cache)
+        get_json(urls[1], cache=cache)
+        get_json(urls[0], cache=cache)
+        get_json(urls[2], cache=cache)
+        self.assertEqual(len(cache), 2)
+        self.assertIsNotNone(cache.lookup(urls[0]))
+        self.assertIsNone(cache.lookup(urls[1]))
+
+    def test_not_modified_renews_without_rewriting(self):
+        """
+        Test a 304 renews the entry for its own TTL without encoding
+        and compressing the payload again
+        """
+        url = self.server.add_json("/org", {"login": "google"})
+        cache = self.open_cache()
+        get_json(url, cache=cache)
+        entry = cache.lookup(url)
+        cache.store(url, entry._replace(stored_at=time.time() - 100),
+                    ttl=10)
+        with patch("utils.zlib.compress") as compress:
+            self.assertEqual(get_json(url, cache=cache),
+                             {"login": "google"})
+        compress.assert_not_called()
+        self.assertEqual(cache.not_modified, 1)
+        renewed = cache.lookup(url)
+        self.assertTrue(cache.is_fresh(renewed))
+        self.assertAlmostEqual(renewed.expires_at - renewed.stored_at, 10)
+        self.assertEqual(renewed.etag, entry.etag)
+        self.assertEqual(renewed.payload, {"login": "google"})
+
+
+@unittest.skipIf(utils.aiohttp is None, "aiohttp is not installed")
+class TestAgetJson(unittest.IsolatedAsyncioTestCase):
+    """
+    Test cases for aget_json coroutine against a local stub server
+    """
+    def setUp(self):
+        """
+        Start a stub server
+        """
+        self.server = StubServer().start()
+        self.addCleanup(self.server.stop)
+
+    @parameterized.expand([
+        ("/example", {"payload": True}),
+        ("/holberton", {"payload": False}),
+    ])
+    async def test_aget_json(self, path, payload):
+        """
+        Test aget_json returns expected result
+        """
+        url = self.server.add_json(path, payload)
+        async with AsyncJSONClient() as client:
+            self.assertEqual(await aget_json(url, client), payload)
+
+    async def test_aget_json_reuses_connections(self):
+        """
+        Test concurrent requests never open more connections than
+        the pool size, and sequential ones reuse a single connection
+        """
+        url = self.server.add_json("/org", {"login": "google"})
+        async with AsyncJSONClient(pool_size=4) as client:
+            await asyncio.gather(*(aget_json(url, client)
+                                   for _ in range(40)))
+            self.assertLessEqual(self.server.connections, 4)
+        self.server.reset_counters()
+        async with AsyncJSONClient() as client:
+            for _ in range(10):
+                await aget_json(url, client)
+        self.assertEqual(self.server.connections, 1)
+        self.assertEqual(self.server.requests, 10)
+
+    async def test_aclose_json_client(self):
+        """
+        Test the session of the running loop is closed, and replaced
+        by the next call
+        """
+        url = self.server.add_json("/org", {"login": "google"})
+        await aget_json(url)
+        session = utils._async_client._get_session()
+        await aclose_json_client()
+        self.assertTrue(session.closed)
+        await aclose_json_client()
+        self.assertEqual(await aget_json(url), {"login": "google"})
+        self.assertIsNot(utils._async_client._get_session(), session)
+
+
+@unittest.skipIf(utils.aiohttp is None, "aiohttp is not installed")
+class TestAgetJsonAcrossLoops(unittest.TestCase):
+    """
+    Test cases for the module-wide client used from successive loops
+    """
+    def test_no_unclosed_sessions(self):
+        """
+        Test successive asyncio.run calls close the session they opened
+        """
+        with StubServer() as server:
+            url = server.add_json("/org", {"login": "google"})
+            with warnings.catch_warnings(record=True) as caught:
+                warnings.simplefilter("always", ResourceWarning)
+                for _ in range(3):
+                    self.assertEqual(asyncio.run(aget_json(url)),
+                                     {"login": "google"})
+                asyncio.run(aclose_json_client())
+                gc.collect()
+        self.assertEqual([w for w in caught
+                          if issubclass(w.category, ResourceWarning)], [])
+
+    def test_loops_in_threads(self):
+        """
+        Test loops running in several threads at once each keep their
+        own session of the module-wide client
+        """
+        errors = []
+        results = []
+
+        async def fetch_many(url):
+            for _ in range(100):
+                results.append(await aget_json(url))
+
+        def run(url):
+            try:
+                asyncio.run(fetch_many(url))
+            except Exception as exc:
+                errors.append(exc)
+
+        with StubServer() as server:
+            url = server.add_json("/org", {"login": "google"})
+            with warnings.catch_warnings(record=True) as caught:
+                warnings.simplefilter("always")
+                threads = [threading.Thread(target=run, args=(url,))
+                           for _ in range(4)]
+                for thread in threads:
+                    thread.start()
+                for thread in threads:
+                    thread.join(30)
+                gc.collect()
+        self.assertEqual(errors, [])
+        self.assertEqual(results, [{"login": "google"}] * 400)
+        self.assertEqual([str(w.message) for w in caught
+                          if issubclass(w.category, ResourceWarning)], [])
+
 
 class TestMemoize(unittest.TestCase):
     """
@@ -86,6 +627,283 @@ class TestMemoize(unittest.TestCase):
         self.assertEqual(obj2.a_method, 1)
         self.assertEqual(obj2.call_count, 1)
 
+    def test_memoize_ttl(self):
+        """
+        Test a value is recomputed once it is ttl seconds old
+        """
+        class TestClass:
+            @memoize(ttl=10)
+            def a_method(self):
+                return object()
+
+        obj = TestClass()
+        with patch('utils.time.monotonic', return_value=100):
+            first = obj.a_method
+            self.assertIs(obj.a_method, first)
+        with patch('utils.time.monotonic', return_value=109):
+            self.assertIs(obj.a_method, first)
+        with patch('utils.time.monotonic', return_value=110):
+            self.assertIsNot(obj.a_method, first)
+        self.assertEqual(TestClass.a_method.stats,
+                         {"hits": 2, "misses": 2})
+
+    def test_memoize_invalidate(self):
+        """
+        Test invalidate makes the next read recompute the value
+        """
+        class TestClass:
+            @memoize
+            def a_method(self):
+                return object()
+
+        obj = TestClass()
+        first = obj.a_method
+        TestClass.a_method.invalidate(obj)
+        self.assertIsNot(obj.a_method, first)
+        TestClass.a_method.invalidate(TestClass())
+
+    def test_memoize_single_flight(self):
+        """
+        Test concurrent first reads compute the value only once
+        """
+        started = threading.Event()
+        release = threading.Event()
+
+        class TestClass:
+            def __init__(self):
+                self.call_count = 0
+
+            @memoize
+            def a_method(self):
+                self.call_count += 1
+                started.set()
+                release.wait(5)
+                return self.call_count
+
+        obj = TestClass()
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(
+            obj.a_method)) for _ in range(8)]
+        threads[0].start()
+        started.wait(5)
+        for thread in threads[1:]:
+            thread.start()
+        time.sleep(0.05)
+        release.set()
+        for thread in threads:
+            thread.join(5)
+        self.assertEqual(results, [1] * 8)
+        self.assertEqual(obj.call_count, 1)
+        self.assertEqual(TestClass.a_method.stats,
+                         {"hits": 7, "misses": 1})
+
+    def test_memoize_counts_concurrent_hits(self):
+        """
+        Test no hit is lost when many threads read a stored value
+        """
+        class TestClass:
+            @memoize
+            def a_method(self):
+                return 42
+
+        obj = TestClass()
+        obj.a_method
+
+        def read():
+            for _ in range(1000):
+                obj.a_method
+
+        threads = [threading.Thread(target=read) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(5)
+        self.assertEqual(TestClass.a_method.stats,
+                         {"hits": 8000, "misses": 1})
+
+    def test_memoize_slots(self):
+        """
+        Test values go to a declared slot, or to the side table when
+        the instance only allows weak references
+        """
+        class Slotted:
+            __slots__ = ("_a_method",)
+
+            @memoize
+            def a_method(self):
+                return object()
+
+        class WeakOnly:
+            __slots__ = ("__weakref__",)
+
+            @memoize(ttl=60)
+            def a_method(self):
+                return object()
+
+        for cls in (Slotted, WeakOnly):
+            obj = cls()
+            value = obj.a_method
+            self.assertIs(obj.a_method, value)
+            cls.a_method.invalidate(obj)
+            self.assertIsNot(obj.a_method, value)
+        self.assertEqual(len(WeakOnly.a_method._table), 1)
+        del obj
+        gc.collect()
+        self.assertEqual(len(WeakOnly.a_method._table), 0)
+
+    def test_memoize_without_room(self):
+        """
+        Test a class with neither slot nor weak references is refused
+        """
+        class Sealed:
+            __slots__ = ()
+
+            @memoize
+            def a_method(self):
+                return 42
+
+        with self.assertRaises(TypeError):
+            Sealed().a_method
+
+    def test_memoize_does_not_cache_errors(self):
+        """
+        Test an exception is raised again on the next read
+        """
+        class TestClass:
+            def __init__(self):
+                self.call_count = 0
+
+            @memoize
+            def a_method(self):
+                self.call_count += 1
+                raise KeyError("a")
+
+        obj = TestClass()
+        for _ in range(2):
+            with self.assertRaises(KeyError):
+                obj.a_method
+        self.assertEqual(obj.call_count, 2)
+
+
+class TestAmemoize(unittest.IsolatedAsyncioTestCase):
+    """
+    Test cases for amemoize decorator
+    """
+    def make_class(self, **kwargs):
+        """
+        Class with a memoized coroutine method counting its calls
+        """
+        class TestClass:
+            def __init__(self):
+                self.call_count = 0
+
+            @amemoize(**kwargs)
+            async def a_method(self):
+                self.call_count += 1
+                await asyncio.sleep(0.01)
+                return self.call_count
+
+        return TestClass
+
+    async def test_amemoize(self):
+        """
+        Test concurrent awaits share one call and cache its result
+        """
+        TestClass = self.make_class()
+        obj = TestClass()
+        results = await asyncio.gather(*(obj.a_method for _ in range(100)))
+        self.assertEqual(results, [1] * 100)
+        self.assertEqual(await obj.a_method, 1)
+        self.assertEqual(obj.call_count, 1)
+        self.assertEqual(obj._a_method, 1)
+        self.assertEqual(TestClass.a_method.stats,
+                         {"hits": 100, "misses": 1})
+
+    async def test_amemoize_ttl(self):
+        """
+        Test a result is recomputed once it is ttl seconds old
+        """
+        obj = self.make_class(ttl=0.1)()
+        self.assertEqual(await obj.a_method, 1)
+        self.assertEqual(await obj.a_method, 1)
+        await asyncio.sleep(0.1)
+        self.assertEqual(await obj.a_method, 2)
+
+    async def test_amemoize_cancel_one_awaiter(self):
+        """
+        Test cancelling one awaiter leaves the shared call running
+        """
+        obj = self.make_class()()
+        cancelled = asyncio.ensure_future(obj.a_method)
+        survivor = asyncio.ensure_future(obj.a_method)
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        self.assertEqual(await survivor, 1)
+        self.assertTrue(cancelled.cancelled())
+        self.assertEqual(obj.call_count, 1)
+
+    async def test_amemoize_does_not_cache_errors(self):
+        """
+        Test a failed call is retried by the next await
+        """
+        class TestClass:
+            def __init__(self):
+                self.call_count = 0
+
+            @amemoize(name="shared")
+            async def a_method(self):
+                self.call_count += 1
+                if self.call_count == 1:
+                    raise KeyError("a")
+                return self.call_count
+
+        obj = TestClass()
+        with self.assertRaises(KeyError):
+            await obj.a_method
+        self.assertEqual(await obj.a_method, 2)
+        self.assertEqual(obj._shared, 2)
+
+    async def test_amemoize_invalidate_in_flight(self):
+        """
+        Test invalidating during a call keeps its late result from being
+        stored, while its awaiters still get it
+        """
+        TestClass = self.make_class()
+        obj = TestClass()
+        stale = asyncio.ensure_future(obj.a_method)
+        await asyncio.sleep(0)
+        TestClass.a_method.invalidate(obj)
+        self.assertEqual(await stale, 1)
+        self.assertFalse(hasattr(obj, "_a_method"))
+        self.assertEqual(await obj.a_method, 2)
+        self.assertEqual(obj._a_method, 2)
+
+    async def test_amemoize_tasks_held_weakly(self):
+        """
+        Test calls in progress are keyed by weak reference and dropped
+        once they finish
+        """
+        TestClass = self.make_class()
+        obj = TestClass()
+        pending = obj.a_method
+        self.assertEqual(len(TestClass.a_method._tasks), 1)
+        await pending
+        self.assertEqual(len(TestClass.a_method._tasks), 0)
+
+    async def test_amemoize_needs_weakref(self):
+        """
+        Test a slotted class without __weakref__ gets a hint
+        """
+        class Slotted:
+            __slots__ = ("_a_method",)
+
+            @amemoize
+            async def a_method(self):
+                return 1
+
+        with self.assertRaisesRegex(TypeError, "__weakref__"):
+            Slotted().a_method
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -1,20 +1,78 @@
 #!/usr/bin/env python3
 """Generic utilities for github org client.
 """
+import asyncio
+import codecs
+import json
+import os
+import sqlite3
+import threading
+import zlib
+import time
+import weakref
 import requests
-from functools import wraps
+from collections import OrderedDict
+from functools import lru_cache, partial, wraps
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from typing import (
     Mapping,
     Sequence,
     Any,
+    Awaitable,
     Dict,
     Callable,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
 )
 
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
 __all__ = [
+    "AsyncJSONClient",
+    "AsyncMemoizedProperty",
+    "CacheEntry",
+    "DiskCache",
+    "MemoizedProperty",
+    "ResponseCache",
     "access_nested_map",
+    "aclose_json_client",
+    "amemoize",
+    "compile_path",
+    "aget_json",
+    "aget_json_page",
     "get_json",
+    "get_json_page",
+    "get_json_backend",
+    "get_json_projected",
+    "get_session",
+    "iter_json_array",
+    "loads_json",
+    "make_session",
     "memoize",
+    "pluck",
+    "pluck_many",
+    "project",
+    "set_cache",
+    "set_json_backend",
+    "set_session",
 ]
 
 
@@ -40,14 +98,1012 @@ def access_nested_map(nested_map: Mapping, path: Sequence) -> Any:
     return nested_map
 
 
-def get_json(url: str) -> Dict:
+_MISSING = object()
+
+
+def compile_path(path: Sequence, default: Any = _MISSING
+                 ) -> Callable[[Mapping], Any]:
+    """Getter of the value at path in a nested map, for reading the
+    same path out of many maps.
+    It behaves like access_nested_map, raising KeyError for a missing
+    key unless default is given, in which case default is returned.
+    Plain dicts are walked with a type check and dict.get rather than
+    an isinstance check against Mapping. The walk is compiled once per
+    path; the default is bound afterwards, so it is never confused
+    with an equal one of another type (0 and False).
+    Example
+    -------
+    >>> license_key = compile_path(("license", "key"), None)
+    >>> license_key({"license": {"key": "mit"}}), license_key({})
+    ('mit', None)
+    """
+    path = tuple(path)
+    if default is _MISSING:
+        return _compile_raising_path(path)
+    return partial(_compile_path(path), default)
+
+
+@lru_cache(maxsize=256)
+def _compile_raising_path(path: Tuple) -> Callable[[Mapping], Any]:
+    """Getter of path raising KeyError for a missing key"""
+    return partial(_compile_path(path), _MISSING)
+
+
+@lru_cache(maxsize=256)
+def _compile_path(path: Tuple) -> Callable[[Any, Mapping], Any]:
+    """Build get(default, nested_map), the walk behind compile_path"""
+    def missing(key: Any, default: Any) -> Any:
+        """default, or KeyError without one"""
+        if default is _MISSING:
+            raise KeyError(key)
+        return default
+
+    def step(value: Any, key: Any) -> Any:
+        """value[key], or _MISSING"""
+        if type(value) is dict:
+            return value.get(key, _MISSING)
+        if not isinstance(value, Mapping):
+            return _MISSING
+        try:
+            return value[key]
+        except KeyError:
+            return _MISSING
+
+    if len(path) == 1:
+        key, = path
+
+        def get(default: Any, nested_map: Mapping) -> Any:
+            """Value at path"""
+            value = step(nested_map, key)
+            return missing(key, default) if value is _MISSING else value
+    elif len(path) == 2:
+        first, second = path
+
+        def get(default: Any, nested_map: Mapping) -> Any:
+            """Value at path"""
+            if type(nested_map) is dict:
+                value = nested_map.get(first, _MISSING)
+            else:
+                value = step(nested_map, first)
+            if value is _MISSING:
+                return missing(first, default)
+            if type(value) is dict:
+                value = value.get(second, _MISSING)
+            else:
+                value = step(value, second)
+            return missing(second, default) if value is _MISSING else value
+    else:
+        def get(default: Any, nested_map: Mapping) -> Any:
+            """Value at path"""
+            value = nested_map
+            for key in path:
+                value = step(value, key)
+                if value is _MISSING:
+                    return missing(key, default)
+            return value
+    return get
+
+
+def pluck(records: Iterable[Mapping], path: Sequence,
+          default: Any = None) -> List[Any]:
+    """Value at path of every record, default where it is missing.
+    Example
+    -------
+    >>> pluck([{"license": {"key": "mit"}}, {"license": None}],
+    ...       ("license", "key"))
+    ['mit', None]
+    """
+    return list(map(compile_path(path, default), records))
+
+
+def pluck_many(records: Iterable[Mapping], paths: Sequence[Sequence],
+               default: Any = None) -> List[List[Any]]:
+    """Values at each of paths of every record, read in a single pass
+    over records and returned as one list (column) per path.
+    Example
+    -------
+    >>> names, keys = pluck_many(repos, [("name",), ("license", "key")])
+    """
+    getters = [compile_path(path, default) for path in paths]
+    columns: List[List[Any]] = [[] for _ in getters]
+    fields = [(get, column.append) for get, column in zip(getters, columns)]
+    for record in records:
+        for get, append in fields:
+            append(get(record))
+    return columns
+
+
+JSON_BACKENDS = ("orjson", "ujson", "json")
+
+
+def set_json_backend(name: Optional[str] = None) -> str:
+    """Select the JSON decoder used by get_json, aget_json and DiskCache.
+    Parameters
+    ----------
+    name: str, optional
+        "orjson", "ujson" or "json". None or "auto" picks the first
+        one installed, in that order.
+    Returns
+    -------
+    The name of the selected backend
+    """
+    global _json_backend, _json_loads
+    loaders = {
+        "orjson": orjson.loads if orjson is not None else None,
+        "ujson": ujson.loads if ujson is not None else None,
+        "json": json.loads,
+    }
+    if name is None or name == "auto":
+        name = next(name for name in JSON_BACKENDS if loaders[name])
+    elif name not in loaders:
+        raise ValueError("unknown JSON backend {!r}, expected one of {}"
+                         .format(name, ", ".join(JSON_BACKENDS)))
+    elif loaders[name] is None:
+        raise RuntimeError("{} is not installed".format(name))
+    _json_backend, _json_loads = name, loaders[name]
+    return name
+
+
+def get_json_backend() -> str:
+    """Name of the JSON backend in use"""
+    return _json_backend
+
+
+def loads_json(data: bytes) -> Any:
+    """Decode a UTF-8 JSON document with the selected backend.
+    The bytes go straight to the decoder, without first being decoded
+    to text.
+    """
+    return _json_loads(data)
+
+
+_json_backend: str
+_json_loads: Callable[[bytes], Any]
+set_json_backend()
+
+
+def make_session(pool_size: int = 10, retries: int = 3,
+                 backoff_factor: float = 0.2,
+                 keep_alive: bool = True) -> requests.Session:
+    """Build a requests.Session with a tuned connection pool.
+    Parameters
+    ----------
+    pool_size: int
+        Number of connections kept open per host
+    retries: int
+        How many times a failed connection or a 5xx answer is retried
+    backoff_factor: float
+        Base of the exponential sleep between retries, in seconds
+    keep_alive: bool
+        Keep connections open between requests
+    """
+    retry = Retry(total=retries, backoff_factor=backoff_factor,
+                  status_forcelist=(500, 502, 503, 504))
+    adapter = HTTPAdapter(pool_connections=pool_size,
+                          pool_maxsize=pool_size, max_retries=retry)
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    if not keep_alive:
+        session.headers["Connection"] = "close"
+    return session
+
+
+_session: Optional[requests.Session] = None
+
+
+def get_session() -> requests.Session:
+    """Module-wide session used by get_json, created on first use.
+    """
+    global _session
+    if _session is None:
+        _session = make_session()
+    return _session
+
+
+def set_session(session: Optional[requests.Session]) -> None:
+    """Replace the module-wide session used by get_json. None makes
+    the next call create a default one again.
+    """
+    global _session
+    _session = session
+
+
+class CacheEntry(NamedTuple):
+    """Cached response: decoded payload, pagination links, the
+    validators sent back to revalidate it, and the time until which it
+    may be served without revalidation (None: always revalidate)."""
+    payload: Any
+    links: Dict[str, str]
+    etag: Optional[str]
+    last_modified: Optional[str]
+    stored_at: float
+    expires_at: Optional[float] = None
+
+
+class ResponseCache:
+    """In-memory LRU cache of get_json responses keyed by URL.
+    Cached URLs are fetched again with If-None-Match / If-Modified-Since,
+    and a 304 Not Modified answer returns the cached object without
+    decoding any JSON.
+    Parameters
+    ----------
+    maxsize: int
+        Number of URLs kept before the least recently used is evicted
+    Attributes
+    ----------
+    hits: int
+        Lookups that found an entry
+    misses: int
+        Lookups that found none
+    not_modified: int
+        Revalidations answered with 304
+    """
+
+    def __init__(self, maxsize: int = 256) -> None:
+        """Init method of ResponseCache"""
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """Number of cached URLs"""
+        return len(self._entries)
+
+    def lookup(self, url: str) -> Optional[CacheEntry]:
+        """Entry cached for url, counted as a hit or a miss"""
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(url)
+            self.hits += 1
+            return entry
+
+    def is_fresh(self, entry: CacheEntry) -> bool:
+        """Whether entry can be served without revalidating it"""
+        return entry.expires_at is not None and time.time() < entry.expires_at
+
+    def store(self, url: str, entry: CacheEntry) -> None:
+        """Cache entry for url, evicting the least recently used URLs"""
+        with self._lock:
+            self._entries[url] = entry
+            self._entries.move_to_end(url)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def revalidated(self, url: str, entry: CacheEntry) -> None:
+        """Record a 304 answer for url, whose cached entry is entry,
+        and mark that entry as stored now"""
+        with self._lock:
+            self.not_modified += 1
+            if url in self._entries:
+                self._entries[url] = entry._replace(stored_at=time.time())
+
+    def clear(self) -> None:
+        """Drop every entry and reset the counters"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.not_modified = 0
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Counters and size of the cache"""
+        return {"hits": self.hits, "misses": self.misses,
+                "not_modified": self.not_modified, "size": len(self)}
+
+
+class DiskCache(ResponseCache):
+    """Persistent get_json cache in a SQLite file, so a new process can
+    answer from disk what an earlier one fetched.
+    Entries younger than their TTL are served without any request;
+    older ones are revalidated like in ResponseCache, and a 304 only
+    renews their timestamps. Payloads are stored as zlib-compressed
+    JSON, and the least recently used entries are evicted once there
+    are more than maxsize of them or the stored payloads exceed
+    max_bytes.
+    Parameters
+    ----------
+    path: str
+        SQLite database file, created if needed
+    ttl: float
+        Default time to live of new entries, in seconds
+    max_bytes: int
+        Bound on the total size of the compressed payloads
+    maxsize: int
+        Number of URLs kept, as in ResponseCache
+    Example
+    -------
+    >>> set_cache(DiskCache("~/.cache/github-org-client.sqlite"))
+    """
+
+    def __init__(self, path: str, ttl: float = 300.0,
+                 max_bytes: int = 64 * 1024 * 1024,
+                 maxsize: int = 4096) -> None:
+        """Init method of DiskCache"""
+        super().__init__(maxsize)
+        self.path = os.path.expanduser(path)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._db = sqlite3.connect(self.path, check_same_thread=False,
+                                   isolation_level=None)
+        self._db.executescript("""
+            PRAGMA journal_mode=WAL;
+            PRAGMA synchronous=NORMAL;
+            CREATE TABLE IF NOT EXISTS responses (
+                url TEXT PRIMARY KEY,
+                body BLOB NOT NULL,
+                links TEXT NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                stored_at REAL NOT NULL,
+                expires_at REAL NOT NULL,
+                accessed_at REAL NOT NULL,
+                size INTEGER NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS responses_accessed_at
+                ON responses (accessed_at);
+        """)
+
+    def __len__(self) -> int:
+        """Number of cached URLs"""
+        with self._lock:
+            return self._db.execute(
+                "SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def lookup(self, url: str) -> Optional[CacheEntry]:
+        """Entry cached for url, counted as a hit or a miss"""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT body, links, etag, last_modified, stored_at,"
+                " expires_at FROM responses WHERE url = ?",
+                (url,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self._db.execute(
+                "UPDATE responses SET accessed_at = ? WHERE url = ?",
+                (time.time(), url))
+            self.hits += 1
+        body, links, etag, last_modified, stored_at, expires_at = row
+        return CacheEntry(_json_loads(zlib.decompress(body)),
+                          json.loads(links), etag, last_modified,
+                          stored_at, expires_at)
+
+    def store(self, url: str, entry: CacheEntry,
+              ttl: Optional[float] = None) -> None:
+        """Cache entry for url for ttl seconds (the cache's ttl by
+        default), then evict the least recently used entries past
+        maxsize or max_bytes"""
+        body = zlib.compress(json.dumps(entry.payload).encode())
+        now = time.time()
+        ttl = self.ttl if ttl is None else ttl
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses VALUES"
+                " (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (url, body, json.dumps(entry.links), entry.etag,
+                 entry.last_modified, entry.stored_at,
+                 entry.stored_at + ttl, now, len(body)))
+            count, total = self._db.execute(
+                "SELECT COUNT(*), SUM(size) FROM responses").fetchone()
+            if count > self.maxsize or total > self.max_bytes:
+                self._evict(count - self.maxsize, total - self.max_bytes)
+
+    def revalidated(self, url: str, entry: CacheEntry) -> None:
+        """Record a 304 answer for url and renew its entry for as long
+        as it was stored for, leaving its payload as it is on disk"""
+        now = time.time()
+        with self._lock:
+            self.not_modified += 1
+            self._db.execute(
+                "UPDATE responses SET stored_at = ?,"
+                " expires_at = ? + expires_at - stored_at,"
+                " accessed_at = ? WHERE url = ?", (now, now, now, url))
+
+    def _evict(self, excess_rows: int, excess_bytes: int) -> None:
+        """Delete least recently used entries, at least excess_rows of
+        them and totalling at least excess_bytes"""
+        doomed = []
+        for url, size in self._db.execute(
+                "SELECT url, size FROM responses ORDER BY accessed_at"):
+            if excess_rows <= 0 and excess_bytes <= 0:
+                break
+            doomed.append((url,))
+            excess_rows -= 1
+            excess_bytes -= size
+        self._db.executemany("DELETE FROM responses WHERE url = ?", doomed)
+
+    def clear(self) -> None:
+        """Drop every entry and reset the counters"""
+        with self._lock:
+            self._db.execute("DELETE FROM responses")
+            self.hits = self.misses = self.not_modified = 0
+
+    def close(self) -> None:
+        """Close the database"""
+        self._db.close()
+
+
+_cache: Optional[ResponseCache] = None
+
+
+def set_cache(cache: Optional[ResponseCache]) -> None:
+    """Set the module-wide cache used by get_json. None disables it.
+    """
+    global _cache
+    _cache = cache
+
+
+def _fetch(url: str, session: Optional[requests.Session],
+           cache: Optional[ResponseCache],
+           with_links: bool = True) -> Tuple[Any, Dict[str, str]]:
+    """Payload and pagination links of url, through cache if any.
+    Uncached links are only parsed when with_links is set."""
+    session = session or get_session()
+    cache = cache if cache is not None else _cache
+    if cache is None:
+        response = session.get(url)
+        return _decode(response), _links(response) if with_links else {}
+    entry = cache.lookup(url)
+    if entry is not None and cache.is_fresh(entry):
+        return entry.payload, entry.links
+    headers = {}
+    if entry is not None and entry.etag:
+        headers["If-None-Match"] = entry.etag
+    if entry is not None and entry.last_modified:
+        headers["If-Modified-Since"] = entry.last_modified
+    response = session.get(url, headers=headers)
+    if response.status_code == 304 and entry is not None:
+        cache.revalidated(url, entry)
+        return entry.payload, entry.links
+    payload, links = _decode(response), _links(response)
+    if response.ok:
+        cache.store(url, CacheEntry(
+            payload, links, response.headers.get("ETag"),
+            response.headers.get("Last-Modified"), time.time()))
+    return payload, links
+
+
+def _decode(response: requests.Response) -> Any:
+    """JSON payload of response, decoded from its raw bytes"""
+    return _json_loads(response.content)
+
+
+def _links(response: requests.Response) -> Dict[str, str]:
+    """Map each rel of the Link header of response to its URL"""
+    return {rel: link["url"] for rel, link in response.links.items()}
+
+
+def get_json(url: str, session: Optional[requests.Session] = None,
+             cache: Optional[ResponseCache] = None) -> Dict:
     """Get JSON from remote URL.
+    Requests go through session, or the module-wide session, so that
+    connections are kept alive and reused between calls. With cache,
+    or a module-wide cache set by set_cache, responses are cached and
+    revalidated with conditional requests.
+    """
+    return _fetch(url, session, cache, with_links=False)[0]
+
+
+def get_json_page(url: str, session: Optional[requests.Session] = None,
+                  cache: Optional[ResponseCache] = None
+                  ) -> Tuple[Any, Dict[str, str]]:
+    """Get JSON from remote URL along with its pagination links.
+    Returns
+    -------
+    The decoded payload, and a dict mapping each rel of the Link
+    header ("next", "last", ...) to its URL
+    """
+    return _fetch(url, session, cache)
+
+
+_WHITESPACE = " \t\n\r"
+_SEPARATORS = _WHITESPACE + ",]"
+
+
+def iter_json_array(chunks: Iterable[bytes]) -> Iterator[Any]:
+    """Decode the elements of a top-level JSON array, one at a time,
+    from an iterable of UTF-8 chunks.
+    Only the text of the element being decoded is buffered, so the
+    whole array is never held in memory, decoded or not.
+    Example
+    -------
+    >>> list(iter_json_array([b'[{"a": 1}, ', b'{"a": 2}]']))
+    [{'a': 1}, {'a': 2}]
+    """
+    decoder = json.JSONDecoder()
+    text = codecs.getincrementaldecoder("utf-8")()
+    chunks = iter(chunks)
+    buffer, pos, more = "", 0, True
+    started = False
+    while True:
+        while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+            pos += 1
+        if pos < len(buffer):
+            char = buffer[pos]
+            if not started:
+                if char != "[":
+                    raise ValueError("expected a JSON array")
+                started = True
+                pos += 1
+                continue
+            if char == "]":
+                return
+            if char == ",":
+                pos += 1
+                continue
+            try:
+                value, end = decoder.raw_decode(buffer, pos)
+            except ValueError:
+                end = None
+            # a number cut by the end of a chunk ("1" of "12", "2" of
+            # "2.5") decodes too, so only take values followed by a
+            # separator, unless the input is over
+            if end is not None and (not more or end < len(buffer) and
+                                    buffer[end] in _SEPARATORS):
+                yield value
+                pos = end
+                continue
+        if not more:
+            raise ValueError("invalid or truncated JSON array")
+        chunk = next(chunks, None)
+        if chunk is None:
+            more = False
+            buffer = buffer[pos:] + text.decode(b"", final=True)
+        else:
+            buffer = buffer[pos:] + text.decode(chunk)
+        pos = 0
+
+
+_MISSING_PATH = object()
+
+
+def project(record: Mapping, paths: Iterable[Sequence]) -> Dict:
+    """Copy of record holding only the nested keys at paths.
+    Paths missing from record are left out.
+    Example
+    -------
+    >>> project({"name": "a", "license": {"key": "mit", "url": "..."},
+    ...          "owner": {}}, [("name",), ("license", "key")])
+    {'name': 'a', 'license': {'key': 'mit'}}
+    """
+    result: Dict = {}
+    for path in paths:
+        value = compile_path(path, _MISSING_PATH)(record)
+        if value is _MISSING_PATH:
+            continue
+        target = result
+        for key in path[:-1]:
+            target = target.setdefault(key, {})
+        target[path[-1]] = value
+    return result
+
+
+def get_json_projected(url: str, paths: Iterable[Sequence],
+                       session: Optional[requests.Session] = None,
+                       chunk_size: int = 64 * 1024) -> List[Dict]:
+    """Get a JSON array from remote URL, keeping only the nested keys
+    at paths of every element.
+    The body is decoded while it streams in, one element at a time, so
+    neither the raw body nor the full decoded array is held in memory.
+    Responses bypass the get_json cache.
+    Example
+    -------
+    >>> get_json_projected(repos_url, [("name",), ("license", "key")])
+    [{'name': 'episodes.dart', 'license': {'key': 'bsd-3-clause'}}, ...]
+    """
+    paths = [tuple(path) for path in paths]
+    session = session or get_session()
+    with session.get(url, stream=True) as response:
+        response.raise_for_status()
+        return [project(record, paths) for record in
+                iter_json_array(response.iter_content(chunk_size))]
+
+
+class AsyncJSONClient:
+    """Shared keep-alive connection pool for aget_json, backed by aiohttp.
+    Parameters
+    ----------
+    pool_size: int
+        Maximum number of open connections (0 for no limit)
+    pool_size_per_host: int
+        Maximum number of open connections per host (0 for no limit)
+    timeout: float
+        Total timeout of one request, in seconds
+    connect_timeout: float, optional
+        Timeout for establishing a connection, in seconds
+    keepalive_timeout: float
+        How long an idle connection is kept open, in seconds
+    Example
+    -------
+    >>> async with AsyncJSONClient(pool_size=20) as client:
+    ...     await client.get_json("https://api.github.com/orgs/google")
+    """
+
+    def __init__(self, pool_size: int = 100, pool_size_per_host: int = 0,
+                 timeout: float = 30.0,
+                 connect_timeout: Optional[float] = None,
+                 keepalive_timeout: float = 15.0) -> None:
+        """Init method of AsyncJSONClient"""
+        if aiohttp is None:
+            raise RuntimeError("aget_json requires aiohttp to be installed")
+        self.pool_size = pool_size
+        self.pool_size_per_host = pool_size_per_host
+        self.timeout = timeout
+        self.connect_timeout = connect_timeout
+        self.keepalive_timeout = keepalive_timeout
+        # (session, task closing it) per event loop, dropped along
+        # with its loop
+        self._sessions: weakref.WeakKeyDictionary = \
+            weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def _get_session(self) -> "aiohttp.ClientSession":
+        """Pooled session of the running loop, created on first use.
+        Every loop gets its own session, closed when that loop shuts
+        down (asyncio.run cancels the task waiting to close it), so
+        loops in different threads can share the client."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            session, _ = self._sessions.get(loop, (None, None))
+            if session is None or session.closed:
+                connector = aiohttp.TCPConnector(
+                    limit=self.pool_size,
+                    limit_per_host=self.pool_size_per_host,
+                    keepalive_timeout=self.keepalive_timeout)
+                session = aiohttp.ClientSession(
+                    connector=connector,
+                    timeout=aiohttp.ClientTimeout(
+                        total=self.timeout, connect=self.connect_timeout))
+                self._sessions[loop] = (session, loop.create_task(
+                    self._close_on_shutdown(session)))
+        return session
+
+    @staticmethod
+    async def _close_on_shutdown(session: "aiohttp.ClientSession") -> None:
+        """Wait until cancelled, then close session on its own loop"""
+        try:
+            await asyncio.Event().wait()
+        finally:
+            await session.close()
+
+    async def get_json(self, url: str) -> Dict:
+        """Get JSON from remote URL over a pooled connection.
+        """
+        async with self._get_session().get(url) as response:
+            return _json_loads(await response.read())
+
+    async def get_json_page(self, url: str) -> Tuple[Any, Dict[str, str]]:
+        """Get JSON from remote URL along with its pagination links.
+        """
+        async with self._get_session().get(url) as response:
+            links = {str(rel): str(link["url"])
+                     for rel, link in response.links.items()}
+            return _json_loads(await response.read()), links
+
+    async def close(self) -> None:
+        """Close the pooled connections of the running loop. Sessions of
+        other loops are closed when their own loop shuts down."""
+        with self._lock:
+            session, closer = self._sessions.pop(
+                asyncio.get_running_loop(), (None, None))
+        if session is not None:
+            await session.close()
+            closer.cancel()
+
+    async def __aenter__(self) -> "AsyncJSONClient":
+        """Use the client as an async context manager"""
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        """Close the pool on exit"""
+        await self.close()
+
+
+_async_client: Optional[AsyncJSONClient] = None
+_async_client_lock = threading.Lock()
+
+
+async def aget_json(url: str,
+                    client: Optional[AsyncJSONClient] = None) -> Dict:
+    """Get JSON from remote URL without blocking the event loop.
+    Requests go through client, or a module-wide AsyncJSONClient
+    created on first use, so connections are kept alive and reused.
     """
-    response = requests.get(url)
-    return response.json()
+    return await _get_async_client(client).get_json(url)
 
 
-def memoize(fn: Callable) -> Callable:
+async def aget_json_page(url: str, client: Optional[AsyncJSONClient] = None
+                         ) -> Tuple[Any, Dict[str, str]]:
+    """Get JSON from remote URL along with its pagination links,
+    without blocking the event loop.
+    """
+    return await _get_async_client(client).get_json_page(url)
+
+
+async def aclose_json_client() -> None:
+    """Close the connections of the running loop in the module-wide
+    AsyncJSONClient used by aget_json and aget_json_page, if one was
+    created. The next call on this loop opens new ones.
+    """
+    if _async_client is not None:
+        await _async_client.close()
+
+
+def _get_async_client(client: Optional[AsyncJSONClient]) -> AsyncJSONClient:
+    """client, or the module-wide AsyncJSONClient"""
+    global _async_client
+    if client is not None:
+        return client
+    with _async_client_lock:
+        if _async_client is None:
+            _async_client = AsyncJSONClient()
+    return _async_client
+
+
+class _Flight:
+    """A computation in progress that other threads wait for"""
+    __slots__ = ("done", "value", "error")
+
+    def __init__(self) -> None:
+        """Init method of _Flight"""
+        self.done = threading.Event()
+        self.value: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class MemoizedProperty(property):
+    """Property computing its value once per instance, as built by
+    memoize.
+    The value is stored on the instance as _<name> (the method name by
+    default) and, with a ttl, recomputed once it is ttl seconds old.
+    Classes with __slots__ only need to declare _<name> (and
+    _<name>_expires with a ttl); instances that cannot hold those
+    attributes keep their value in a side table of weak references
+    instead, which needs "__weakref__" in their __slots__.
+    When several threads read a missing value at once, one computes it
+    and the others wait for its result.
+    Attributes
+    ----------
+    hits: int
+        Reads answered with a stored value or another thread's result
+    misses: int
+        Reads that computed the value
+    Each thread counts its hits in its own counter, so reading a stored
+    value takes no lock; hits is their sum. Misses are counted under
+    the lock the computation takes anyway.
+    """
+
+    def __init__(self, fn: Callable, ttl: Optional[float] = None,
+                 name: Optional[str] = None) -> None:
+        """Init method of MemoizedProperty"""
+        @wraps(fn)
+        def memoized(obj):
+            """"memoized wraps"""
+            return self._get(obj)
+
+        super().__init__(memoized)
+        self.fn = fn
+        self.ttl = ttl
+        self.attr_name = "_{}".format(name or fn.__name__)
+        self.expires_name = "{}_expires".format(self.attr_name)
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._hit_counters: List[List[int]] = []
+        self._flights: Dict[int, _Flight] = {}
+        self._table: weakref.WeakKeyDictionary = \
+            weakref.WeakKeyDictionary()
+
+    def _stored(self, obj: Any) -> Any:
+        """Value stored for obj, or _MISSING if absent or expired"""
+        value = getattr(obj, self.attr_name, _MISSING)
+        expires = 0
+        if value is _MISSING and self._table:
+            try:
+                value, expires = self._table.get(obj, (_MISSING, 0))
+            except TypeError:
+                pass
+        elif self.ttl is not None:
+            expires = getattr(obj, self.expires_name, 0)
+        if value is not _MISSING and self.ttl is not None and \
+                expires <= time.monotonic():
+            return _MISSING
+        return value
+
+    def _store(self, obj: Any, value: Any) -> None:
+        """Store value for obj, on obj itself when it has room for it"""
+        expires = 0 if self.ttl is None else time.monotonic() + self.ttl
+        try:
+            setattr(obj, self.attr_name, value)
+            if self.ttl is not None:
+                setattr(obj, self.expires_name, expires)
+            return
+        except AttributeError:
+            self._forget_value(obj)
+        try:
+            self._table[obj] = (value, expires)
+        except TypeError:
+            raise TypeError(
+                "cannot memoize {} on {}: add {!r} or '__weakref__' to "
+                "its __slots__".format(self.fn.__name__, type(obj).__name__,
+                                       self.attr_name)) from None
+
+    @property
+    def hits(self) -> int:
+        """Reads answered without computing, summed over every thread"""
+        return sum(counter[0] for counter in self._hit_counters)
+
+    def _hit(self) -> None:
+        """Count a hit in the counter of the calling thread"""
+        try:
+            self._local.hits[0] += 1
+        except AttributeError:
+            counter = self._local.hits = [1]
+            with self._lock:
+                self._hit_counters.append(counter)
+
+    def _get(self, obj: Any) -> Any:
+        """Stored value of obj, computing it at most once at a time"""
+        value = self._stored(obj)
+        if value is not _MISSING:
+            self._hit()
+            return value
+        leader = False
+        with self._lock:
+            value = self._stored(obj)
+            flight = self._flights.get(id(obj))
+            if value is _MISSING and flight is None:
+                flight = self._flights[id(obj)] = _Flight()
+                self.misses += 1
+                leader = True
+        if not leader:
+            self._hit()
+        if value is not _MISSING:
+            return value
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+        try:
+            flight.value = self.fn(obj)
+            self._store(obj, flight.value)
+        except BaseException as exc:
+            flight.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._flights[id(obj)]
+            flight.done.set()
+        return flight.value
+
+    def invalidate(self, obj: Any) -> None:
+        """Forget the value stored on obj, so the next read recomputes it
+        """
+        self._forget_value(obj)
+
+    def _forget_value(self, obj: Any) -> None:
+        """Drop the value stored for obj, wherever it is kept"""
+        for name in (self.attr_name, self.expires_name):
+            try:
+                delattr(obj, name)
+            except AttributeError:
+                pass
+        try:
+            self._table.pop(obj, None)
+        except TypeError:
+            pass
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Hit and miss counters, across every instance"""
+        return {"hits": self.hits, "misses": self.misses}
+
+
+class AsyncMemoizedProperty(MemoizedProperty):
+    """Property memoizing the result of a coroutine method, as built by
+    amemoize.
+    Reading the property returns an awaitable. While the value is being
+    computed, every reader awaits the same task, shielded so that a
+    cancelled reader does not cancel it for the others. A computation
+    that fails or is cancelled is not cached, and neither is one that
+    was invalidated while it ran.
+    Computations in progress are kept in a table of weak references to
+    their instances, so classes with __slots__ need "__weakref__" in
+    them.
+    """
+
+    def __init__(self, fn: Callable, ttl: Optional[float] = None,
+                 name: Optional[str] = None) -> None:
+        """Init method of AsyncMemoizedProperty"""
+        super().__init__(fn, ttl, name)
+        self._tasks: weakref.WeakKeyDictionary = \
+            weakref.WeakKeyDictionary()
+
+    def _get(self, obj: Any) -> Awaitable:
+        """Awaitable of the stored value of obj, computing it at most
+        once at a time"""
+        value = self._stored(obj)
+        if value is not _MISSING:
+            self._hit()
+            return _resolved(value)
+        try:
+            task = self._tasks.get(obj)
+        except TypeError:
+            raise TypeError(
+                "cannot amemoize {} on {}: add '__weakref__' to its "
+                "__slots__".format(self.fn.__name__,
+                                   type(obj).__name__)) from None
+        if task is None or task.get_loop() is not asyncio.get_running_loop():
+            with self._lock:
+                self.misses += 1
+            task = asyncio.ensure_future(self._compute(obj))
+            self._tasks[obj] = task
+            task.add_done_callback(lambda done: self._forget(obj, done))
+        else:
+            self._hit()
+        return asyncio.shield(task)
+
+    async def _compute(self, obj: Any) -> Any:
+        """Await the method and store its result on obj, unless this
+        computation was invalidated or replaced in the meantime"""
+        value = await self.fn(obj)
+        if self._tasks.get(obj) is asyncio.current_task():
+            self._store(obj, value)
+        return value
+
+    def _forget(self, obj: Any, task: asyncio.Task) -> None:
+        """Drop a finished task unless it was already replaced"""
+        if self._tasks.get(obj) is task:
+            del self._tasks[obj]
+
+    def invalidate(self, obj: Any) -> None:
+        """Forget the value stored on obj, and detach any computation of
+        it in progress: its readers still get its result, but it is not
+        stored, and the next read recomputes it
+        """
+        super().invalidate(obj)
+        try:
+            self._tasks.pop(obj, None)
+        except TypeError:
+            pass
+
+
+async def _resolved(value: Any) -> Any:
+    """Awaitable returning value"""
+    return value
+
+
+def amemoize(fn: Optional[Callable] = None, *, ttl: Optional[float] = None,
+             name: Optional[str] = None) -> Callable:
+    """Decorator to memoize a coroutine method.
+    The result is stored on the instance as _<name>, so naming the
+    memoized sync property lets both share one value.
+    Example
+    -------
+    class MyClass:
+        @amemoize(ttl=60)
+        async def a_method(self):
+            return await fetch()
+    >>> my_object = MyClass()
+    >>> await asyncio.gather(*(my_object.a_method for _ in range(1000)))
+    (fetch is awaited once)
+    """
+    if fn is None:
+        return lambda fn: AsyncMemoizedProperty(fn, ttl, name)
+    return AsyncMemoizedProperty(fn, ttl, name)
+
+
+def memoize(fn: Optional[Callable] = None, *,
+            ttl: Optional[float] = None) -> Callable:
     """Decorator to memoize a method.
     Example
     -------
@@ -56,20 +1112,21 @@ def memoize(fn: Callable) -> Callable:
         def a_method(self):
             print("a_method called")
             return 42
+
+        @memoize(ttl=60)
+        def refreshed(self):
+            return fetch()
     >>> my_object = MyClass()
     >>> my_object.a_method
     a_method called
     42
     >>> my_object.a_method
     42
+    >>> MyClass.a_method.invalidate(my_object)
+    >>> my_object.a_method
+    a_method called
+    42
     """
-    attr_name = "_{}".format(fn.__name__)
-
-    @wraps(fn)
-    def memoized(self):
-        """"memoized wraps"""
-        if not hasattr(self, attr_name):
-            setattr(self, attr_name, fn(self))
-        return getattr(self, attr_name)
-
-    return property(memoized)
+    if fn is None:
+        return lambda fn: MemoizedProperty(fn, ttl)
+    return MemoizedProperty(fn, ttl)
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Benchmark amerge fan-in over N=4, 64 and 1024 concurrent generators
+against the measure_runtime pattern of gathering one list per generator.
+
+Each generator yields --items values, awaiting asyncio.sleep(--interval)
+before each one. Reported are the time to the first merged item, the
+total time and the merged throughput.
+
+Usage: ./bench_amerge.py [-N 4 64 1024] [--items 100] [--interval 0]
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+from typing import AsyncIterator, Dict
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                os.pardir, '0x02-python_async_comprehension'))
+
+loops = __import__('loops')
+amerge = __import__('3-amerge').amerge
+
+
+async def source(items: int, interval: float) -> AsyncIterator[float]:
+    """Yield items random floats, sleeping interval before each"""
+    for _ in range(items):
+        await asyncio.sleep(interval)
+        yield random.uniform(0, 10)
+
+
+async def collect(agen: AsyncIterator[float]) -> list:
+    """Collect a whole generator into a list"""
+    return [value async for value in agen]
+
+
+async def bench_gather(n: int, items: int, interval: float) -> Dict:
+    """Gather one list per generator, like measure_runtime"""
+    start = time.perf_counter()
+    lists = await asyncio.gather(*(collect(source(items, interval))
+                                   for _ in range(n)))
+    total = time.perf_counter() - start
+    return {"first": total, "total": total,
+            "count": sum(len(values) for values in lists)}
+
+
+async def bench_amerge(n: int, items: int, interval: float,
+                       maxsize: int) -> Dict:
+    """Consume all generators as one merged stream"""
+    start = time.perf_counter()
+    first = None
+    count = 0
+    async for _ in amerge(*(source(items, interval) for _ in range(n)),
+                          maxsize=maxsize):
+        if first is None:
+            first = time.perf_counter() - start
+        count += 1
+    return {"first": first, "total": time.perf_counter() - start,
+            "count": count}
+
+
+def main() -> None:
+    """Parse arguments and print one line per N and strategy"""
+    loops.install_from_env()
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("-N", type=int, nargs="+", default=[4, 64, 1024])
+    parser.add_argument("--items", type=int, default=100)
+    parser.add_argument("--interval", type=float, default=0)
+    parser.add_argument("--maxsize", type=int, default=64)
+    args = parser.parse_args()
+
+    print("{:>6} {:<8} {:>10} {:>10} {:>14}".format(
+        "N", "strategy", "first ms", "total ms", "items/s"))
+    for n in args.N:
+        for name, run in (
+                ("gather", lambda: bench_gather(n, args.items,
+                                                args.interval)),
+                ("amerge", lambda: bench_amerge(n, args.items,
+                                                args.interval,
+                                                args.maxsize))):
+            result = asyncio.run(run())
+            print("{:>6} {:<8} {:>10.3f} {:>10.3f} {:>14.0f}".format(
+                n, name, result["first"] * 1e3, result["total"] * 1e3,
+                result["count"] / result["total"]))
+
+
+if __name__ == "__main__":
+    main()
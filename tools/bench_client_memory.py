@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Memory held by many GithubOrgClient objects, with the __slots__ layout
+against the same class rebuilt with a per-instance __dict__.
+
+Every client gets its org and repos payload memoized, pointing at shared
+payload objects, so only the per-client overhead is measured.
+
+Usage: ./bench_client_memory.py [-n 100000] [--json FILE]
+"""
+import argparse
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), os.pardir,
+    '0x03-Unittests_and_integration_tests'))
+
+harness = __import__('harness')
+from client import GithubOrgClient  # noqa: E402
+from fixtures import TEST_PAYLOAD  # noqa: E402
+
+
+def with_dict(cls: type) -> type:
+    """cls rebuilt without __slots__, as it was before them"""
+    namespace = {name: value for name, value in vars(cls).items()
+                 if name not in cls.__slots__ + ("__slots__",)}
+    return type(cls.__name__, cls.__bases__, namespace)
+
+
+def measure(cls: type, n: int) -> harness.BenchResult:
+    """Traced bytes and build time of n memoized clients of cls"""
+    org_payload, repos_payload = TEST_PAYLOAD[0][:2]
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter_ns()
+    clients = []
+    for i in range(n):
+        client = cls("org{}".format(i))
+        client._org = org_payload
+        client._repos_payload = repos_payload
+        clients.append(client)
+    elapsed = time.perf_counter_ns() - start
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del clients
+    return harness.BenchResult(
+        "{}[n={}]".format("slots" if "__slots__" in vars(cls) else "dict",
+                          n),
+        [elapsed], params={"n": n, "bytes": size})
+
+
+def main() -> None:
+    """Parse arguments and run the benchmarks"""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("-n", type=int, default=100000)
+    parser.add_argument("--json", metavar="FILE")
+    args = parser.parse_args()
+
+    results = [measure(with_dict(GithubOrgClient), args.n),
+               measure(GithubOrgClient, args.n)]
+    print("{:<20} {:>12} {:>14} {:>10}".format(
+        "layout", "MiB", "bytes/client", "build ms"))
+    for result in results:
+        size = result.params["bytes"]
+        print("{:<20} {:>12.1f} {:>14.0f} {:>10.1f}".format(
+            result.name, size / 2 ** 20, size / result.params["n"],
+            result.samples_ns[0] / 1e6))
+    if args.json:
+        harness.write_json(results, args.json)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Measure peak RSS and tasks per second of wait_n and task_wait_n
+for several max_concurrency window sizes.
+
+Every configuration runs in a fresh interpreter, because peak RSS is a
+high-water mark for the whole process and would otherwise only grow.
+
+Usage: ./bench_concurrency.py [-n 100000] [-d 0] [-k 10 100 1000 0]
+(a window of 0 means unbounded, i.e. every task created up front)
+"""
+import argparse
+import asyncio
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+from typing import Dict, Optional
+
+ASYNC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                         os.pardir, '0x01-python_async_function')
+sys.path.insert(0, ASYNC_DIR)
+
+loops = __import__('loops')
+wait_n = __import__('1-concurrent_coroutines').wait_n
+task_wait_n = __import__('4-tasks').task_wait_n
+
+TARGETS = {"wait_n": wait_n, "task_wait_n": task_wait_n}
+
+
+def run_one(target: str, n: int, max_delay: float,
+            max_concurrency: Optional[int]) -> Dict:
+    """Run a single configuration in this process and report it."""
+    start = time.perf_counter()
+    asyncio.run(TARGETS[target](n, max_delay, max_concurrency))
+    elapsed = time.perf_counter() - start
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return {
+        "target": target,
+        "n": n,
+        "max_delay": max_delay,
+        "max_concurrency": max_concurrency,
+        "seconds": elapsed,
+        "tasks_per_second": n / elapsed,
+        "peak_rss_mib": peak_kb / 1024,
+    }
+
+
+def main() -> None:
+    """Parse arguments and run every configuration in a subprocess."""
+    loops.install_from_env()
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("-n", type=int, default=100000)
+    parser.add_argument("-d", "--max-delay", type=float, default=0)
+    parser.add_argument("-k", "--windows", type=int, nargs="+",
+                        default=[10, 100, 1000, 10000, 0])
+    parser.add_argument("--target", choices=sorted(TARGETS))
+    parser.add_argument("--child", action="store_true",
+                        help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        window = args.windows[0] or None
+        print(json.dumps(run_one(args.target, args.n, args.max_delay,
+                                 window)))
+        return
+
+    targets = [args.target] if args.target else sorted(TARGETS)
+    print("{:<12} {:>8} {:>14} {:>14}".format(
+        "target", "window", "tasks/s", "peak RSS MiB"))
+    for target in targets:
+        for window in args.windows:
+            out = subprocess.run(
+                [sys.executable, __file__, "--child", "--target", target,
+                 "-n", str(args.n), "-d", str(args.max_delay),
+                 "-k", str(window)],
+                check=True, stdout=subprocess.PIPE, universal_newlines=True)
+            result = json.loads(out.stdout)
+            print("{:<12} {:>8} {:>14.0f} {:>14.1f}".format(
+                target, window or "all", result["tasks_per_second"],
+                result["peak_rss_mib"]))
+
+
+if __name__ == "__main__":
+    main()
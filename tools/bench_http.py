@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Fetch org and repos payloads for many orgs from a local stub server and
+compare sequential get_json with concurrent aget_json over one pool.
+
+Usage: ./bench_http.py [--orgs 200] [--pool 20] [-r 3]
+"""
+import argparse
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), os.pardir,
+    '0x03-Unittests_and_integration_tests'))
+
+loops = __import__('loops')
+harness = __import__('harness')
+from client import GithubOrgClient  # noqa: E402
+from fixtures import TEST_PAYLOAD  # noqa: E402
+from stub_server import StubServer  # noqa: E402
+import utils  # noqa: E402
+
+
+def main() -> None:
+    """Parse arguments, serve the fixtures and run the benchmarks"""
+    loops.install_from_env()
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--orgs", type=int, default=200)
+    parser.add_argument("--pool", type=int, default=20)
+    parser.add_argument("-r", "--repeat", type=int, default=3)
+    parser.add_argument("--json", metavar="FILE")
+    args = parser.parse_args()
+
+    org_payload, repos_payload = TEST_PAYLOAD[0][:2]
+    names = ["org{}".format(i) for i in range(args.orgs)]
+    results = []
+    with StubServer() as server:
+        for name in names:
+            GithubOrgClient.ORG_URL = server.add_org(
+                name, org_payload, repos_payload)
+
+        def sequential() -> None:
+            for name in names:
+                GithubOrgClient(name).repos_payload
+
+        async def concurrent() -> None:
+            async with utils.AsyncJSONClient(pool_size=args.pool) as pool:
+                await GithubOrgClient.afetch_many(names, pool)
+
+        for name, run in (("get_json sequential", sequential),
+                          ("aget_json concurrent",
+                           lambda: asyncio.run(concurrent()))):
+            server.reset_counters()
+            result = harness.bench(run, name=name, warmup=0,
+                                   repeat=args.repeat,
+                                   params={"orgs": args.orgs})
+            result.params["connections"] = server.connections
+            results.append(result)
+
+    print("{:<22} {:>12} {:>12} {:>12}".format(
+        "strategy", "median ms", "requests/s", "connections"))
+    for result in results:
+        print("{:<22} {:>12.1f} {:>12.0f} {:>12}".format(
+            result.name, result.median_s * 1e3,
+            2 * args.orgs / result.median_s, result.params["connections"]))
+    if args.json:
+        harness.write_json(results, args.json)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Decode time of a large repos payload with every installed JSON backend
+of utils, against what response.json() did before: decode the body to
+text, then parse it with the stdlib.
+
+The payload is the fixture repos repeated --scale times.
+
+Usage: ./bench_json.py [--scale 100] [-r 10] [--json FILE]
+"""
+import argparse
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), os.pardir,
+    '0x03-Unittests_and_integration_tests'))
+
+harness = __import__('harness')
+from fixtures import TEST_PAYLOAD  # noqa: E402
+import utils  # noqa: E402
+
+
+def main() -> None:
+    """Parse arguments, build the payload and run the benchmarks"""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--scale", type=int, default=100)
+    parser.add_argument("-r", "--repeat", type=int, default=10)
+    parser.add_argument("--json", metavar="FILE")
+    args = parser.parse_args()
+
+    body = json.dumps(TEST_PAYLOAD[0][1] * args.scale).encode()
+    params = {"scale": args.scale, "body_bytes": len(body)}
+    results = [harness.bench(lambda: json.loads(body.decode("utf-8")),
+                             name="text+json", repeat=args.repeat,
+                             params=params)]
+    for name in utils.JSON_BACKENDS:
+        try:
+            utils.set_json_backend(name)
+        except RuntimeError:
+            print("{} is not installed, skipped".format(name))
+            continue
+        results.append(harness.bench(
+            lambda: utils.loads_json(body), name=name, repeat=args.repeat,
+            params=params))
+    utils.set_json_backend()
+
+    print("payload: {} repos, {:.1f} MiB".format(
+        len(TEST_PAYLOAD[0][1]) * args.scale, len(body) / 2 ** 20))
+    print("{:<12} {:>12} {:>10} {:>9}".format(
+        "backend", "median ms", "MiB/s", "speedup"))
+    baseline = results[0].median_s
+    for result in results:
+        print("{:<12} {:>12.2f} {:>10.0f} {:>8.2f}x".format(
+            result.name, result.median_s * 1e3,
+            len(body) / 2 ** 20 / result.median_s,
+            baseline / result.median_s))
+    if args.json:
+        harness.write_json(results, args.json)
+
+
+if __name__ == "__main__":
+    main()
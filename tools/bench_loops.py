@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Compare wait_n, task_wait_n and measure_runtime throughput on the
+default asyncio loop and on uvloop (when it is installed).
+
+Usage: ./bench_loops.py [-n 10000] [-r 5] [--skip-runtime] [--json FILE]
+"""
+import argparse
+import asyncio
+import os
+import sys
+from typing import List
+
+TOOLS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(TOOLS_DIR, os.pardir,
+                                '0x01-python_async_function'))
+
+harness = __import__('harness')
+loops = __import__('loops')
+wait_n = __import__('1-concurrent_coroutines').wait_n
+task_wait_n = __import__('4-tasks').task_wait_n
+
+sys.path.insert(0, os.path.join(TOOLS_DIR, os.pardir,
+                                '0x02-python_async_comprehension'))
+measure_runtime = __import__('2-measure_runtime').measure_runtime
+
+
+async def run_loop_benchmarks(loop_name: str, n: int, repeat: int,
+                              skip_runtime: bool) -> List:
+    """Benchmark every target on the running loop"""
+    results = []
+    for target in (wait_n, task_wait_n):
+        results.append(await harness.abench(
+            lambda: target(n, 0), name="{}[{}]".format(
+                target.__name__, loop_name),
+            repeat=repeat, params={"loop": loop_name, "n": n}))
+    if not skip_runtime:
+        results.append(await harness.abench(
+            measure_runtime, name="measure_runtime[{}]".format(loop_name),
+            warmup=0, repeat=1, params={"loop": loop_name}))
+    return results
+
+
+def main() -> None:
+    """Parse arguments and run the benchmarks under every loop"""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("-n", type=int, default=10000)
+    parser.add_argument("-r", "--repeat", type=int, default=5)
+    parser.add_argument("--skip-runtime", action="store_true",
+                        help="skip measure_runtime, which sleeps ~10s")
+    parser.add_argument("--json", metavar="FILE")
+    args = parser.parse_args()
+
+    results = []
+    for name in loops.available():
+        installed = loops.install(name)
+        results += asyncio.run(run_loop_benchmarks(
+            installed, args.n, args.repeat, args.skip_runtime))
+    loops.install("asyncio")
+
+    print("{:<30} {:>12} {:>14}".format("benchmark", "median ms", "tasks/s"))
+    for result in results:
+        n = result.params.get("n")
+        print("{:<30} {:>12.3f} {:>14}".format(
+            result.name, result.median_s * 1e3,
+            "{:.0f}".format(n / result.median_s) if n else "-"))
+    if args.json:
+        harness.write_json(results, args.json)
+
+
+if __name__ == "__main__":
+    main()
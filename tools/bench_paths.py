@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Calls per second of reading license.key out of the fixture repos with
+access_nested_map against the getters built by utils.compile_path.
+
+Usage: ./bench_paths.py [-n 1000] [-r 20] [--json FILE]
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), os.pardir,
+    '0x03-Unittests_and_integration_tests'))
+
+harness = __import__('harness')
+from fixtures import TEST_PAYLOAD  # noqa: E402
+from utils import access_nested_map, compile_path  # noqa: E402
+
+PATH = ("license", "key")
+
+
+def main() -> None:
+    """Parse arguments and run the benchmarks"""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("-n", type=int, default=1000,
+                        help="copies of the fixture repos per round")
+    parser.add_argument("-r", "--repeat", type=int, default=20)
+    parser.add_argument("--json", metavar="FILE")
+    args = parser.parse_args()
+
+    repos = TEST_PAYLOAD[0][1] * args.n
+
+    def nested() -> None:
+        for repo in repos:
+            try:
+                access_nested_map(repo, PATH)
+            except KeyError:
+                pass
+
+    def compiled() -> None:
+        get = compile_path(PATH)
+        for repo in repos:
+            try:
+                get(repo)
+            except KeyError:
+                pass
+
+    def compiled_default() -> None:
+        get = compile_path(PATH, None)
+        for repo in repos:
+            get(repo)
+
+    params = {"calls": len(repos)}
+    results = [harness.bench(fn, name=name, repeat=args.repeat,
+                             params=params)
+               for name, fn in (("access_nested_map", nested),
+                                ("compile_path", compiled),
+                                ("compile_path+default", compiled_default))]
+
+    print("{:<22} {:>12} {:>14} {:>9}".format(
+        "accessor", "median ms", "calls/s", "speedup"))
+    baseline = results[0].median_s
+    for result in results:
+        print("{:<22} {:>12.2f} {:>14,.0f} {:>8.2f}x".format(
+            result.name, result.median_s * 1e3,
+            len(repos) / result.median_s, baseline / result.median_s))
+    if args.json:
+        harness.write_json(results, args.json)
+
+
+if __name__ == "__main__":
+    main()
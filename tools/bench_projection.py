@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Memory and latency of decoding a large repos payload in full against the
+streaming, projecting parse of utils.iter_json_array / utils.project.
+
+The payload is the fixture repos repeated --scale times (1000 by default,
+9000 repos). The body is fed in 64 KiB chunks, as iter_content would.
+"peak" is the largest traced allocation during the parse; "kept" is
+what the result still holds afterwards.
+
+Usage: ./bench_projection.py [--scale 1000] [-r 5] [--json FILE]
+"""
+import argparse
+import gc
+import json
+import os
+import sys
+import tracemalloc
+from typing import Any, Callable, Tuple
+
+sys.path.insert(0, os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), os.pardir,
+    '0x03-Unittests_and_integration_tests'))
+
+harness = __import__('harness')
+from fixtures import TEST_PAYLOAD  # noqa: E402
+from utils import iter_json_array, project  # noqa: E402
+
+PATHS = [("name",), ("license", "key")]
+CHUNK_SIZE = 64 * 1024
+
+
+def traced(fn: Callable[[], Any]) -> Tuple[int, int]:
+    """Peak traced bytes while fn runs, and bytes its result keeps"""
+    gc.collect()
+    tracemalloc.start()
+    result = fn()
+    kept, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return peak, kept
+
+
+def main() -> None:
+    """Parse arguments, build the payload and run the benchmarks"""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--scale", type=int, default=1000)
+    parser.add_argument("-r", "--repeat", type=int, default=5)
+    parser.add_argument("--json", metavar="FILE")
+    args = parser.parse_args()
+
+    body = json.dumps(TEST_PAYLOAD[0][1] * args.scale).encode()
+    view = memoryview(body)
+
+    def chunks():
+        return (view[i:i + CHUNK_SIZE]
+                for i in range(0, len(body), CHUNK_SIZE))
+
+    def full() -> Any:
+        return json.loads(body)
+
+    def full_projected() -> Any:
+        return [project(repo, PATHS) for repo in json.loads(body)]
+
+    def streamed() -> Any:
+        return [project(repo, PATHS) for repo in iter_json_array(chunks())]
+
+    results = []
+    for name, fn in (("full", full), ("full+project", full_projected),
+                     ("streamed+project", streamed)):
+        peak, kept = traced(fn)
+        result = harness.bench(fn, name=name, warmup=1, repeat=args.repeat,
+                               params={"scale": args.scale,
+                                       "body_bytes": len(body),
+                                       "peak_bytes": peak,
+                                       "kept_bytes": kept})
+        results.append(result)
+
+    print("payload: {} repos, {:.1f} MiB".format(
+        len(TEST_PAYLOAD[0][1]) * args.scale, len(body) / 2 ** 20))
+    print("{:<20} {:>12} {:>10} {:>10}".format(
+        "parse", "median ms", "peak MiB", "kept MiB"))
+    for result in results:
+        print("{:<20} {:>12.1f} {:>10.1f} {:>10.1f}".format(
+            result.name, result.median_s * 1e3,
+            result.params["peak_bytes"] / 2 ** 20,
+            result.params["kept_bytes"] / 2 ** 20))
+    if args.json:
+        harness.write_json(results, args.json)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Resident memory and query latency of the raw repos payload against the
+columnar RepoTable of GithubOrgClient.
+
+"table" queries reuse the indexes the table builds on first use;
+"cold" queries run on a table without them, so they include building
+the indexes they need.
+
+The payload is the fixture repos repeated --scale times, decoded from
+JSON so that every repo is a separate object, as fetched.
+
+Usage: ./bench_repo_table.py [--scale 1000] [-r 20] [--json FILE]
+"""
+import argparse
+import gc
+import heapq
+import json
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), os.pardir,
+    '0x03-Unittests_and_integration_tests'))
+
+harness = __import__('harness')
+from client import GithubOrgClient, RepoTable  # noqa: E402
+from fixtures import TEST_PAYLOAD  # noqa: E402
+
+
+def main() -> None:
+    """Parse arguments, build the payload and run the benchmarks"""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--scale", type=int, default=1000)
+    parser.add_argument("-r", "--repeat", type=int, default=20)
+    parser.add_argument("--json", metavar="FILE")
+    args = parser.parse_args()
+
+    body = json.dumps(TEST_PAYLOAD[0][1] * args.scale)
+    gc.collect()
+    tracemalloc.start()
+    repos = json.loads(body)
+    payload_bytes = tracemalloc.get_traced_memory()[0]
+    table = RepoTable.from_repos(repos)
+    # what the table keeps once the payload is dropped, names included
+    del repos
+    gc.collect()
+    table_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    repos = json.loads(body)
+
+    def cold() -> RepoTable:
+        """The table without any of its lazily built indexes"""
+        return RepoTable(table.columns)
+
+    queries = (
+        ("license",
+         lambda: [repo["name"] for repo in repos
+                  if GithubOrgClient.has_license(repo, "apache-2.0")],
+         lambda table: table.filter(license="apache-2.0").names),
+        ("top_k",
+         lambda: [repo["name"] for repo in heapq.nlargest(
+             10, repos, key=lambda repo: repo["stargazers_count"])],
+         lambda table: table.top_k("stars", 10).names),
+        ("filter",
+         lambda: [repo["name"] for repo in repos
+                  if repo["language"] == "JavaScript" and not repo["fork"]
+                  and repo["stargazers_count"] >= 100],
+         lambda table: table.filter(language="JavaScript", fork=False,
+                                    min_stars=100).names),
+    )
+
+    params = {"repos": len(repos)}
+    results = []
+    for name, on_payload, on_table in queries:
+        assert on_payload() == on_table(table)
+        results.append(harness.bench(
+            on_payload, name="payload " + name, repeat=args.repeat,
+            params=params))
+        results.append(harness.bench(
+            lambda: on_table(table), name="table " + name,
+            repeat=args.repeat, params=params))
+        results.append(harness.bench(
+            lambda: on_table(cold()), name="table cold " + name,
+            repeat=args.repeat, params=params))
+
+    print("{} repos: payload {:.1f} MiB, table {:.2f} MiB".format(
+        len(repos), payload_bytes / 2 ** 20, table_bytes / 2 ** 20))
+    print("{:<10} {:>12} {:>12} {:>12}".format(
+        "query", "payload ms", "table ms", "cold ms"))
+    for row in range(0, len(results), 3):
+        print("{:<10} {:>12.3f} {:>12.3f} {:>12.3f}".format(
+            queries[row // 3][0],
+            *(result.median_s * 1e3 for result in results[row:row + 3])))
+    if args.json:
+        results[0].params.update(payload_bytes=payload_bytes,
+                                 table_bytes=table_bytes)
+        harness.write_json(results, args.json)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Latency per request of GithubOrgClient.org and repos_payload against a
+local stub server, with and without connection reuse in get_json.
+
+Every sample builds a new client, so memoization never hides a request.
+
+Usage: ./bench_session.py [-r 200] [--json FILE]
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), os.pardir,
+    '0x03-Unittests_and_integration_tests'))
+
+harness = __import__('harness')
+from client import GithubOrgClient  # noqa: E402
+from fixtures import TEST_PAYLOAD  # noqa: E402
+from stub_server import StubServer  # noqa: E402
+import utils  # noqa: E402
+
+
+def main() -> None:
+    """Parse arguments, serve the fixtures and run the benchmarks"""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("-r", "--repeat", type=int, default=200)
+    parser.add_argument("--json", metavar="FILE")
+    args = parser.parse_args()
+
+    org_payload, repos_payload = TEST_PAYLOAD[0][:2]
+    results = []
+    with StubServer() as server:
+        GithubOrgClient.ORG_URL = server.add_org(
+            "google", org_payload, repos_payload)
+        repos_url = server.url + "/orgs/google/repos"
+        for keep_alive in (False, True):
+            utils.set_session(utils.make_session(keep_alive=keep_alive))
+            label = "reuse" if keep_alive else "no reuse"
+
+            def org() -> None:
+                GithubOrgClient("google").org
+
+            def repos_payload_() -> None:
+                client = GithubOrgClient("google")
+                client._org = {"repos_url": repos_url}
+                client.repos_payload
+
+            for name, run in (("org", org),
+                              ("repos_payload", repos_payload_)):
+                server.reset_counters()
+                result = harness.bench(
+                    run, name="{}[{}]".format(name, label),
+                    warmup=5, repeat=args.repeat,
+                    params={"keep_alive": keep_alive})
+                result.params["connections"] = server.connections
+                results.append(result)
+        utils.set_session(None)
+
+    print("{:<26} {:>10} {:>10} {:>10} {:>12}".format(
+        "benchmark", "min us", "median us", "p95 us", "connections"))
+    for result in results:
+        stats = result.stats
+        print("{:<26} {:>10.0f} {:>10.0f} {:>10.0f} {:>12}".format(
+            result.name, stats["min"] / 1e3, stats["median"] / 1e3,
+            stats["p95"] / 1e3, result.params["connections"]))
+    if args.json:
+        harness.write_json(results, args.json)
+
+
+if __name__ == "__main__":
+    main()
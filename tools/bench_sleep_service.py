@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Compare wait_random on plain asyncio.sleep with wait_random on a shared
+SleepService at 10k, 100k and 1M concurrent waiters.
+
+The reported overhead is the wall time beyond max_delay, i.e. the cost
+of creating, scheduling and waking the waiters.
+
+Usage: ./bench_sleep_service.py [-d 1.0] [-n 10000 100000 1000000]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+from typing import Any, Awaitable, Callable
+
+ASYNC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                         os.pardir, '0x01-python_async_function')
+sys.path.insert(0, ASYNC_DIR)
+
+loops = __import__('loops')
+wait_random = __import__('0-basic_async_syntax').wait_random
+SleepService = __import__('5-sleep_service').SleepService
+
+
+async def fan_out(n: int, max_delay: float,
+                  sleep: Callable[[float], Awaitable[Any]]) -> float:
+    """Run n wait_random waiters at once and return the elapsed time."""
+    start = time.perf_counter()
+    await asyncio.gather(*(wait_random(max_delay, sleep) for _ in range(n)))
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    """Parse arguments and print one line per fan-out size and sleeper."""
+    loops.install_from_env()
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("-d", "--max-delay", type=float, default=1.0)
+    parser.add_argument("-n", type=int, nargs="+",
+                        default=[10000, 100000, 1000000])
+    args = parser.parse_args()
+
+    print("{:>9} {:<14} {:>10} {:>12}".format(
+        "waiters", "sleeper", "seconds", "overhead s"))
+    for n in args.n:
+        for name, sleep in (("asyncio.sleep", asyncio.sleep),
+                            ("SleepService", SleepService().sleep)):
+            elapsed = asyncio.run(fan_out(n, args.max_delay, sleep))
+            print("{:>9} {:<14} {:>10.3f} {:>12.3f}".format(
+                n, name, elapsed, elapsed - args.max_delay))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""
+Reusable benchmark harness shared by the project folders.
+
+Timings use time.perf_counter_ns, every benchmark runs warmup rounds that
+are thrown away followed by repeat measured rounds, and results summarise
+min, median, p95 and p99. Async benchmarks can also sample event-loop lag
+while they run. Results serialise to JSON so runs from different commits
+can be compared with `./harness.py compare base.json head.json`.
+"""
+import asyncio
+import json
+import platform
+import subprocess
+import sys
+import time
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+)
+
+__all__ = [
+    "BenchResult",
+    "LoopLagMonitor",
+    "abench",
+    "bench",
+    "compare",
+    "load_json",
+    "percentile",
+    "summarize",
+    "write_json",
+]
+
+NS_PER_S = 1e9
+
+
+def percentile(samples: Sequence[float], q: float) -> float:
+    """Percentile q (0-100) of samples, linearly interpolated.
+    Example
+    -------
+    >>> percentile([1, 2, 3, 4], 50)
+    2.5
+    """
+    if not samples:
+        raise ValueError("percentile of an empty sample")
+    ordered = sorted(samples)
+    rank = (len(ordered) - 1) * q / 100
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def summarize(samples: Sequence[float]) -> Dict[str, float]:
+    """Summary statistics of samples: count, min, median, p95, p99,
+    max and mean.
+    """
+    return {
+        "count": len(samples),
+        "min": min(samples),
+        "median": percentile(samples, 50),
+        "p95": percentile(samples, 95),
+        "p99": percentile(samples, 99),
+        "max": max(samples),
+        "mean": sum(samples) / len(samples),
+    }
+
+
+class BenchResult:
+    """Samples of one benchmark, in nanoseconds.
+    """
+
+    def __init__(self, name: str, samples_ns: List[int],
+                 loop_lag_ns: Optional[List[int]] = None,
+                 params: Optional[Dict[str, Any]] = None) -> None:
+        """Init method of BenchResult"""
+        self.name = name
+        self.samples_ns = samples_ns
+        self.loop_lag_ns = loop_lag_ns
+        self.params = params or {}
+
+    @property
+    def stats(self) -> Dict[str, float]:
+        """Summary statistics of the samples, in nanoseconds"""
+        return summarize(self.samples_ns)
+
+    @property
+    def median_s(self) -> float:
+        """Median sample, in seconds"""
+        return percentile(self.samples_ns, 50) / NS_PER_S
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serialisable form of the result"""
+        data = {
+            "name": self.name,
+            "unit": "ns",
+            "params": self.params,
+            "stats": self.stats,
+            "samples": self.samples_ns,
+        }
+        if self.loop_lag_ns:
+            data["loop_lag"] = summarize(self.loop_lag_ns)
+        return data
+
+    def __repr__(self) -> str:
+        """Short human-readable summary"""
+        stats = self.stats
+        return "<{} min={:.3f}ms median={:.3f}ms p95={:.3f}ms>".format(
+            self.name, stats["min"] / 1e6, stats["median"] / 1e6,
+            stats["p95"] / 1e6)
+
+
+class LoopLagMonitor:
+    """Async context manager sampling how late the event loop wakes up
+    a coroutine that sleeps for interval seconds.
+    Example
+    -------
+    async with LoopLagMonitor() as monitor:
+        await work()
+    monitor.samples_ns
+    """
+
+    def __init__(self, interval: float = 0.001) -> None:
+        """Init method of LoopLagMonitor"""
+        self.interval = interval
+        self.samples_ns: List[int] = []
+        self._task: Optional[asyncio.Task] = None
+
+    async def _sample(self) -> None:
+        """Sleep in a loop and record the lateness of every wake-up"""
+        interval_ns = int(self.interval * NS_PER_S)
+        while True:
+            start = time.perf_counter_ns()
+            await asyncio.sleep(self.interval)
+            self.samples_ns.append(
+                max(0, time.perf_counter_ns() - start - interval_ns))
+
+    async def __aenter__(self) -> "LoopLagMonitor":
+        """Start sampling on the running loop"""
+        self._task = asyncio.ensure_future(self._sample())
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        """Stop sampling"""
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+
+
+def bench(fn: Callable[[], Any], name: Optional[str] = None,
+          warmup: int = 1, repeat: int = 5,
+          params: Optional[Dict[str, Any]] = None) -> BenchResult:
+    """Time repeat calls of fn after warmup discarded calls.
+    Raises ValueError when repeat is below 1.
+    """
+    if repeat < 1:
+        raise ValueError("repeat must be at least 1")
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter_ns()
+        fn()
+        samples.append(time.perf_counter_ns() - start)
+    return BenchResult(name or fn.__name__, samples, params=params)
+
+
+async def abench(fn: Callable[[], Awaitable[Any]],
+                 name: Optional[str] = None, warmup: int = 1,
+                 repeat: int = 5, lag_interval: Optional[float] = None,
+                 params: Optional[Dict[str, Any]] = None) -> BenchResult:
+    """Time repeat awaits of fn() on the running loop after warmup
+    discarded ones, sampling loop lag every lag_interval seconds
+    when it is given. Raises ValueError when repeat is below 1.
+    """
+    if repeat < 1:
+        raise ValueError("repeat must be at least 1")
+    for _ in range(warmup):
+        await fn()
+    samples = []
+    monitor = LoopLagMonitor(lag_interval) if lag_interval else None
+    if monitor is not None:
+        await monitor.__aenter__()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter_ns()
+            await fn()
+            samples.append(time.perf_counter_ns() - start)
+    finally:
+        if monitor is not None:
+            await monitor.__aexit__(None, None, None)
+    return BenchResult(name or fn.__name__, samples,
+                       monitor.samples_ns if monitor else None, params)
+
+
+def _git_commit() -> Optional[str]:
+    """Commit hash of the working tree, if it is a git checkout"""
+    try:
+        out = subprocess.run(["git", "rev-parse", "HEAD"],
+                             stdout=subprocess.PIPE,
+                             stderr=subprocess.DEVNULL,
+                             universal_newlines=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.stdout.strip()
+
+
+def write_json(results: Sequence[BenchResult], path: str) -> Dict:
+    """Write results with run metadata to path ("-" for stdout).
+    """
+    document = {
+        "meta": {
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        },
+        "results": [result.to_dict() for result in results],
+    }
+    if path == "-":
+        json.dump(document, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+    else:
+        with open(path, "w") as fp:
+            json.dump(document, fp, indent=2)
+    return document
+
+
+def load_json(path: str) -> Dict:
+    """Load a document written by write_json"""
+    with open(path) as fp:
+        return json.load(fp)
+
+
+def compare(base: Dict, head: Dict,
+            stat: str = "median") -> List[Dict[str, Any]]:
+    """Compare one statistic of every benchmark present in both
+    documents. A ratio below 1 means head is faster.
+    """
+    base_stats = {r["name"]: r["stats"] for r in base["results"]}
+    rows = []
+    for result in head["results"]:
+        if result["name"] not in base_stats:
+            continue
+        before = base_stats[result["name"]][stat]
+        after = result["stats"][stat]
+        rows.append({"name": result["name"], "base": before,
+                     "head": after,
+                     "ratio": after / before if before else float("inf")})
+    return rows
+
+
+def main(argv: Sequence[str]) -> None:
+    """Command line: compare BASE.json HEAD.json [STAT]"""
+    if len(argv) not in (3, 4) or argv[0] != "compare":
+        sys.exit("usage: harness.py compare BASE.json HEAD.json [STAT]")
+    stat = argv[3] if len(argv) == 4 else "median"
+    rows = compare(load_json(argv[1]), load_json(argv[2]), stat)
+    print("{:<40} {:>14} {:>14} {:>8}".format(
+        "benchmark", "base ms", "head ms", "ratio"))
+    for row in rows:
+        print("{:<40} {:>14.3f} {:>14.3f} {:>8.3f}".format(
+            row["name"], row["base"] / 1e6, row["head"] / 1e6,
+            row["ratio"]))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Event loop selection shared by the async project folders.
+
+Set ASYNC_LOOP=uvloop in the environment (or call install("uvloop")) to
+run every *-main.py entry point and benchmark on uvloop. When uvloop is
+not importable the default asyncio loop is kept, so the switch is always
+safe to set.
+"""
+import asyncio
+import os
+import warnings
+from typing import Optional
+
+__all__ = [
+    "ENV_VAR",
+    "available",
+    "install",
+    "install_from_env",
+]
+
+ENV_VAR = "ASYNC_LOOP"
+LOOPS = ("asyncio", "uvloop", "auto")
+
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+
+def available() -> tuple:
+    """Names of the loops that can be installed here"""
+    return ("asyncio", "uvloop") if uvloop is not None else ("asyncio",)
+
+
+def install(name: Optional[str] = None) -> str:
+    """Install the event loop policy called name.
+    Parameters
+    ----------
+    name: str, optional
+        "asyncio", "uvloop", or "auto" (uvloop when it is importable).
+        Defaults to the ASYNC_LOOP environment variable, then "asyncio".
+    Returns
+    -------
+    The name of the loop that is now installed: "uvloop" falls back to
+    "asyncio" when uvloop is missing.
+    """
+    if name is None:
+        name = os.environ.get(ENV_VAR) or "asyncio"
+    name = name.lower()
+    if name not in LOOPS:
+        raise ValueError("unknown event loop {!r}, expected one of {}"
+                         .format(name, ", ".join(LOOPS)))
+    if name != "asyncio" and uvloop is not None:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+        return "uvloop"
+    asyncio.set_event_loop_policy(None)
+    return "asyncio"
+
+
+def install_from_env() -> Optional[str]:
+    """Install the loop named by ASYNC_LOOP, if that variable is set.
+    Entry points call this on start-up, so it leaves the current policy
+    alone when the variable is unset, and warns and keeps asyncio when
+    it names an unknown loop.
+    """
+    if not os.environ.get(ENV_VAR):
+        return None
+    try:
+        return install()
+    except ValueError as exc:
+        warnings.warn("{}; keeping asyncio".format(exc), RuntimeWarning)
+        return install("asyncio")